@@ -1,17 +1,41 @@
+import io
 import os
+import mmap
+import time
+import errno
+import gzip
+import hashlib
+import shutil
 import logging
+import itertools
+import tempfile
 import uuid
+import zipfile
+import zlib
 from datetime import datetime
-from flask import Flask, request, jsonify, render_template, redirect, url_for, send_file
+from enum import Enum
+from functools import cached_property, lru_cache
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, Optional, Tuple
+from flask import Flask, Request, Response, request, jsonify, render_template, redirect, url_for, send_file, make_response
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
-from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.exceptions import RequestEntityTooLarge, abort
 import cv2
 import numpy as np
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from image_preprocessor import ImagePreprocessor, preprocess_session_images
 from model_processor import ModelProcessor, create_model_processor, ModelProcessingError
+from status_store import StatusStore
+
+# Use orjson for JSON encoding when installed - fall back to Flask's encoder otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Try to import COLMAP wrapper - make it optional
 try:
@@ -24,18 +48,87 @@ except ImportError:
     validate_image_set = lambda x: (True, "Image validation skipped")
     COLMAP_AVAILABLE = False
 
+
+class UploadRequest(Request):
+    """Request that streams /upload file parts straight into the upload folder."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.endpoint != 'upload_files':
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        # Spool each part on the same filesystem as the session directories so
+        # accepting an upload is a rename instead of a second full copy. Parts
+        # not moved into a session by the end of the request are removed by
+        # discard_streamed_uploads, even if parsing the body failed midway.
+        stream = tempfile.NamedTemporaryFile('wb+', dir=app.config['UPLOAD_FOLDER'],
+                                             prefix='.upload_', delete=False)
+        self.streamed_files.append(stream)
+        return stream
+
+    @cached_property
+    def streamed_files(self):
+        """Temporary files created for this request's uploaded parts."""
+        return []
+
+
+class AppJSONProvider(DefaultJSONProvider):
+    """JSON provider that also serializes enums (e.g. COLMAP stages) as their values."""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, Enum):
+            return o.value
+        return DefaultJSONProvider.default(o)
+
+
+class OrjsonJSONProvider(AppJSONProvider):
+    """JSON provider that encodes with orjson, deferring unknown types to the default hook."""
+
+    def _encode(self, obj, indent=False):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        return self._encode(obj, indent=bool(kwargs.get('indent'))).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Build the body straight from orjson's bytes, skipping the str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._encode(obj, indent) + b'\n', mimetype=self.mimetype)
+
+
 # Initialize Flask app
 app = Flask(__name__)
+app.request_class = UploadRequest
+app.json = OrjsonJSONProvider(app) if orjson is not None else AppJSONProvider(app)
 
-# Enable CORS for all routes
-CORS(app)
+# Enable CORS for all routes. The frontend's 3D viewer fetches model files with
+# Range requests, so it needs to read the partial-content and validator headers.
+CORS(app, expose_headers=['Accept-Ranges', 'Content-Range', 'Content-Length', 'ETag', 'Last-Modified'])
 
 # Configuration
 app.config['SECRET_KEY'] = 'your-secret-key-change-in-production'
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['OUTPUT_FOLDER'] = 'outputs'
 app.config['MAX_CONTENT_LENGTH'] = 200 * 1024 * 1024  # 200MB total request size for multiple high-res images
-app.config['ALLOWED_EXTENSIONS'] = {'png', 'jpg', 'jpeg'}  # Restrict to jpg, png, jpeg only
+app.config['ALLOWED_EXTENSIONS'] = frozenset({'png', 'jpg', 'jpeg'})  # Restrict to jpg, png, jpeg only
+app.config['STATUS_DB'] = os.path.join(app.config['OUTPUT_FOLDER'], 'session_status.db')
+app.config['STATUS_TTL_SECONDS'] = 24 * 60 * 60  # Forget session status after a day
+app.config['STATUS_REFRESH_SECONDS'] = 1.0  # Re-read in-flight status from the store at most this often
+# Let the reverse proxy stream large downloads: X-Sendfile (Apache/lighttpd) or an
+# nginx `internal` location mapped onto OUTPUT_FOLDER for X-Accel-Redirect
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
+app.config['X_ACCEL_REDIRECT_PREFIX'] = os.environ.get('X_ACCEL_REDIRECT_PREFIX')
+app.config['SEQUENTIAL_MATCHER_MIN_IMAGES'] = 100  # Default to sequential matching above this many images when the client marks the set as ordered
+app.config['COLMAP_VOCAB_TREE_PATH'] = os.environ.get('COLMAP_VOCAB_TREE_PATH')  # e.g. vocab_tree_flickr100K_words32K.bin
+app.config['VOCAB_TREE_MATCHER_MIN_IMAGES'] = 300  # Default to vocab tree matching above this many images when a tree is configured
+app.config['MAX_JSON_BODY_SIZE'] = 16 * 1024  # API parameters are tiny; larger JSON bodies are rejected unread
+app.config['PROCESSING_WORKERS'] = int(os.environ.get('PROCESSING_WORKERS', 1))  # COLMAP saturates the CPU/GPU itself, so run jobs one at a time
 
 # Ensure required directories exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -63,16 +156,34 @@ try:
         enable_meshing=False,  # Can be enabled for full mesh generation
         cleanup_temp_files=False,  # Keep files for download
         use_gpu=True,  # Enable GPU acceleration if available
-        gpu_indices="0",  # Use first GPU by default
+        gpu_indices=os.environ.get('COLMAP_GPU_INDICES'),  # e.g. "0,1"; unset uses every detected GPU
         enable_dsp_sift=True,  # Enable DSP-SIFT for better features
         enable_guided_matching=True,  # Enable guided matching for improved results
-        enable_geometric_consistency=True  # Enable geometric consistency in dense reconstruction
+        enable_geometric_consistency=True,  # Enable geometric consistency in dense reconstruction
+        vocab_tree_path=app.config['COLMAP_VOCAB_TREE_PATH']  # Vocabulary tree for matching large image sets
     )
     logger.info("COLMAP processor initialized successfully")
 except Exception as e:
     logger.error(f"Failed to initialize COLMAP processor: {str(e)}")
     colmap_processor = None
 
+# Initialize persistent session status store
+try:
+    status_store = StatusStore(app.config['STATUS_DB'], ttl_seconds=app.config['STATUS_TTL_SECONDS'])
+    logger.info("Session status store initialized successfully")
+except Exception as e:
+    logger.error(f"Failed to initialize session status store: {str(e)}")
+    status_store = None
+
+# Persistent worker pool for background reconstruction jobs
+processing_executor = ThreadPoolExecutor(
+    max_workers=app.config['PROCESSING_WORKERS'],
+    thread_name_prefix='photogrammetry-job'
+)
+
+# Pending /colmap/process jobs by session, so they can be reported and cancelled while queued
+colmap_jobs = {}
+
 # Initialize Model processor
 try:
     model_processor = create_model_processor(
@@ -85,51 +196,319 @@ except Exception as e:
     model_processor = None
 
 
+# Library versions and COLMAP availability are fixed once the app has started
+HEALTH_VERSIONS = {
+    'opencv': cv2.__version__,
+    'numpy': np.__version__,
+    'colmap': 'available' if colmap_processor is not None else 'unavailable'
+}
+
+
+# Filename suffixes of the allowed upload formats, checked with a single endswith()
+ALLOWED_SUFFIXES = tuple(f'.{ext}' for ext in sorted(app.config['ALLOWED_EXTENSIONS']))
+
+# Magic bytes of the allowed upload formats, checked with a single startswith()
+IMAGE_SIGNATURES = (
+    b'\xff\xd8\xff',  # JPEG
+    b'\x89PNG\r\n\x1a\n',  # PNG
+)
+
+
 def allowed_file(filename):
     """Check if the uploaded file has an allowed extension."""
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
+    return filename.lower().endswith(ALLOWED_SUFFIXES)
+
 
+def validate_image_file(filename, filepath):
+    """
+    Validate that an uploaded file streamed to disk is a proper image.
 
-def validate_image_file(file):
-    """Validate that the uploaded file is a proper image."""
+    Returns:
+        Tuple of (is_valid, message, file_size)
+    """
     try:
         # Check file extension
-        if not allowed_file(file.filename):
-            return False, "Invalid file type. Only JPG, PNG, and JPEG files are allowed."
+        if not allowed_file(filename):
+            return False, "Invalid file type. Only JPG, PNG, and JPEG files are allowed.", 0
         
-        # Check file size (additional check beyond Flask's MAX_CONTENT_LENGTH)
-        file.seek(0, os.SEEK_END)
-        file_size = file.tell()
-        file.seek(0)  # Reset file pointer
+        # Size and header come from one open descriptor: fstat plus a
+        # positional read, no seeking
+        with open(filepath, 'rb') as f:
+            fd = f.fileno()
+            file_size = os.fstat(fd).st_size
+            file_header = os.pread(fd, 16, 0)
         
+        # Check file size (additional check beyond Flask's MAX_CONTENT_LENGTH)
         if file_size > app.config['MAX_CONTENT_LENGTH']:
-            return False, "File too large. Maximum size is 16MB."
+            return False, "File too large. Maximum size is 16MB.", file_size
         
         if file_size == 0:
-            return False, "Empty file not allowed."
+            return False, "Empty file not allowed.", file_size
         
         # Basic security check - verify it's actually an image
-        file_header = file.read(10)
-        file.seek(0)  # Reset file pointer
-        
-        # Check for common image file signatures
-        image_signatures = [
-            b'\xff\xd8\xff',  # JPEG
-            b'\x89PNG\r\n\x1a\n',  # PNG
-            b'GIF87a',  # GIF87a
-            b'GIF89a',  # GIF89a
-        ]
-        
-        is_valid_image = any(file_header.startswith(sig) for sig in image_signatures)
+        # Check for allowed image file signatures
+        is_valid_image = file_header.startswith(IMAGE_SIGNATURES)
         if not is_valid_image:
-            return False, "File does not appear to be a valid image."
+            return False, "File does not appear to be a valid image.", file_size
         
-        return True, "Valid image file."
+        return True, "Valid image file.", file_size
         
     except Exception as e:
         logger.error(f"File validation error: {str(e)}")
-        return False, "Error validating file."
+        return False, "Error validating file.", 0
+
+
+def store_streamed_upload(temp_path, filepath, file_size):
+    """Move a streamed upload into place, copying in-kernel if a rename is not possible."""
+    try:
+        os.replace(temp_path, filepath)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    
+    # Session directory lives on another filesystem: sendfile(2) avoids a user-space copy
+    with open(temp_path, 'rb') as src, open(filepath, 'wb') as dst:
+        try:
+            offset = 0
+            while offset < file_size:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, file_size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except (AttributeError, OSError):
+            src.seek(0)
+            dst.seek(0)
+            dst.truncate()
+            shutil.copyfileobj(src, dst, length=1024 * 1024)
+    os.remove(temp_path)
+
+
+def file_content_hash(path):
+    """Hash a file's contents (128-bit BLAKE2b hex) through a read-only mapping."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.blake2b(digest_size=16).hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.blake2b(mapped, digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=65536)
+def cached_content_hash(path, mtime_ns, file_size):
+    """Content hash of a stored image, cached per (path, mtime, size) across prechecks."""
+    return file_content_hash(path)
+
+
+@app.teardown_request
+def discard_streamed_uploads(exc=None):
+    """Remove streamed upload parts that were not moved into a session directory."""
+    for stream in request.streamed_files:
+        try:
+            stream.close()
+            os.remove(stream.name)
+        except FileNotFoundError:
+            pass  # Moved into the session directory
+        except OSError as e:
+            logger.warning(f"Failed to remove streamed upload {stream.name}: {str(e)}")
+
+
+@lru_cache(maxsize=16)
+def get_preprocessor(max_dimension):
+    """Get a shared ImagePreprocessor for a resize limit; instances hold no per-run state."""
+    return ImagePreprocessor(max_dimension=max_dimension)
+
+
+def resolve_matcher_type(data, image_count):
+    """
+    Pick the requested matcher, defaulting to cheaper matchers for large image sets.
+
+    Sequential matching only pairs neighbouring images, which suits video frames
+    but reconstructs unordered photo sets badly, so it is only chosen when the
+    client says the images are in capture order ("ordered": true).
+    """
+    matcher_type = data.get('matcher_type')
+    if not matcher_type:
+        # Exhaustive matching compares all O(N^2) image pairs
+        if data.get('ordered') is True and image_count > app.config['SEQUENTIAL_MATCHER_MIN_IMAGES']:
+            matcher_type = 'sequential'
+        elif (image_count > app.config['VOCAB_TREE_MATCHER_MIN_IMAGES']
+                and colmap_processor is not None and colmap_processor.vocab_tree_path):
+            matcher_type = 'vocab_tree'
+        else:
+            matcher_type = 'exhaustive'
+    return matcher_type.lower()
+
+
+def list_session_images(session_dir):
+    """List the uploaded image files in a session directory, sorted by path."""
+    # DirEntry.is_file() uses the d_type from readdir, so no per-file stat()
+    with os.scandir(session_dir) as entries:
+        return sorted(entry.path for entry in entries if entry.is_file() and allowed_file(entry.name))
+
+
+def conditional_json(response, etag=None, last_modified=None):
+    """Add validators to a JSON response and answer 304 when the client's copy is current."""
+    if etag is None:
+        etag = hashlib.blake2b(response.get_data(), digest_size=8).hexdigest()
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # Polling clients must revalidate, but can skip the body when nothing changed
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+
+# MIME types by file extension for attachment downloads and inline viewing
+DOWNLOAD_MIME_TYPES = {
+    'obj': 'model/obj',
+    'ply': 'application/octet-stream',
+    'mtl': 'text/plain',
+    'txt': 'text/plain',
+    'json': 'application/json',
+    'zip': 'application/zip'
+}
+VIEW_MIME_TYPES = {
+    'obj': 'model/obj',
+    'ply': 'application/octet-stream',
+    'gltf': 'model/gltf+json',
+    'glb': 'model/gltf-binary',
+    'fbx': 'application/octet-stream',
+    'mtl': 'text/plain',
+    'txt': 'text/plain',
+    'json': 'application/json'
+}
+
+
+def mime_type_for(filename, mime_types):
+    """Look up a file's MIME type by extension, defaulting to application/octet-stream."""
+    name, dot, extension = filename.rpartition('.')
+    if not dot or not name:
+        return 'application/octet-stream'
+    return mime_types.get(extension.lower(), 'application/octet-stream')
+
+
+# Text outputs (COLMAP .txt models, OBJ meshes, JSON metadata) compress several times over
+COMPRESSIBLE_MIME_TYPES = frozenset({'text/plain', 'application/json', 'model/obj', 'model/gltf+json'})
+
+
+def gzip_sibling(path):
+    """
+    Get a gzip-compressed copy of a file next to it, creating or refreshing it if needed.
+
+    Args:
+        path: File to compress
+
+    Returns:
+        Path of the up-to-date '<path>.gz' file
+    """
+    gz_path = f"{path}.gz"
+    try:
+        if os.stat(gz_path).st_mtime_ns >= os.stat(path).st_mtime_ns:
+            return gz_path
+    except FileNotFoundError:
+        pass
+    
+    # Compress into a temporary file and rename it so readers never see a partial file
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.gzip_')
+    try:
+        with open(path, 'rb') as src, os.fdopen(fd, 'wb') as raw, \
+                gzip.GzipFile(filename=os.path.basename(path), mode='wb', fileobj=raw, compresslevel=6) as dest:
+            shutil.copyfileobj(src, dest, 1024 * 1024)
+        os.replace(temp_path, gz_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return gz_path
+
+
+def send_output_file(path, mimetype, as_attachment=False, download_name=None):
+    """
+    Send a file from the output folder, offloading the transfer to the reverse proxy when configured.
+
+    Without a proxy, send_file hands the open file to the WSGI server's
+    wsgi.file_wrapper, which gunicorn serves with sendfile(2).
+
+    Clients may keep the file but must revalidate it: re-running /process
+    rewrites outputs under the same URL, and a changed file gets a new ETag
+    and Last-Modified, so unchanged files cost a 304 rather than a transfer.
+
+    Text formats are sent gzip-encoded to clients that accept it, from a
+    '.gz' copy compressed once and kept next to the original.
+    """
+    content_encoding = None
+    if mimetype in COMPRESSIBLE_MIME_TYPES and 'gzip' in request.accept_encodings:
+        try:
+            download_name = download_name or os.path.basename(path)
+            path = gzip_sibling(path)
+            content_encoding = 'gzip'
+        except OSError as e:
+            logger.warning(f"Could not compress {path}, sending it uncompressed: {str(e)}")
+    
+    accel_prefix = app.config.get('X_ACCEL_REDIRECT_PREFIX')
+    response = None
+    if accel_prefix:
+        relative_path = os.path.relpath(os.path.abspath(path), os.path.abspath(app.config['OUTPUT_FOLDER']))
+        if not relative_path.startswith(os.pardir):
+            response = make_response('')
+            response.headers['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{Path(relative_path).as_posix()}"
+            response.mimetype = mimetype
+            if as_attachment:
+                response.headers.set('Content-Disposition', 'attachment',
+                                     filename=download_name or os.path.basename(path))
+    
+    if response is None:
+        st = os.stat(path)
+        etag = f"{st.st_ino:x}-{st.st_mtime_ns:x}-{st.st_size:x}"
+        
+        if request.method == 'HEAD':
+            # Same headers as the GET below, answered from the stat alone without opening the file
+            response = make_response('')
+            response.mimetype = mimetype
+            response.headers.set('Content-Disposition', 'attachment' if as_attachment else 'inline',
+                                 filename=download_name or os.path.basename(path))
+            response.accept_ranges = 'bytes'
+            response.last_modified = st.st_mtime
+            response.set_etag(etag)
+            response.content_length = st.st_size
+            response = response.make_conditional(request)
+        else:
+            # Flask emits X-Sendfile itself when USE_X_SENDFILE is enabled
+            response = send_file(
+                path,
+                as_attachment=as_attachment,
+                download_name=download_name,
+                mimetype=mimetype,
+                conditional=True,
+                etag=etag
+            )
+    
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    if mimetype in COMPRESSIBLE_MIME_TYPES:
+        response.vary.add('Accept-Encoding')
+    if content_encoding:
+        response.content_encoding = content_encoding
+    return response
+
+
+def existing_output_files(candidates):
+    """
+    Build output file entries for the candidate paths that exist.
+
+    Args:
+        candidates: Iterable of (type, path) pairs
+
+    Returns:
+        List of {'type', 'path', 'size'} dicts, one stat per candidate
+    """
+    output_files = []
+    for file_type, path in candidates:
+        try:
+            size = os.stat(path).st_size
+        except OSError:
+            continue
+        output_files.append({'type': file_type, 'path': path, 'size': size})
+    return output_files
 
 
 def create_session_directory(session_id):
@@ -139,6 +518,44 @@ def create_session_directory(session_id):
     return session_dir
 
 
+# Endpoints whose JSON bodies carry lists, with the body size their documented maximum needs
+JSON_BODY_LIMITS = {}
+
+
+@app.before_request
+def limit_json_body_size():
+    """Reject oversized JSON bodies before they are read or parsed."""
+    limit = JSON_BODY_LIMITS.get(request.endpoint, app.config['MAX_JSON_BODY_SIZE'])
+    if request.is_json and (request.content_length or 0) > limit:
+        abort(413)
+
+
+# JSON bodies below this size fit in a packet or two; gzip would not save a round trip
+JSON_GZIP_MIN_SIZE = 1024
+
+
+@app.after_request
+def compress_json_response(response):
+    """Gzip JSON API responses for clients that accept it; status bodies grow with detailed_progress."""
+    if (response.status_code != 200 or response.mimetype != 'application/json'
+            or response.direct_passthrough or response.is_streamed or response.content_encoding
+            or 'gzip' not in request.accept_encodings):
+        return response
+    
+    data = response.get_data()
+    if len(data) < JSON_GZIP_MIN_SIZE:
+        return response
+    
+    response.set_data(gzip.compress(data, compresslevel=6))
+    response.content_encoding = 'gzip'
+    response.vary.add('Accept-Encoding')
+    # The ETag was computed over the uncompressed body, so it only holds as a weak validator
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
 @app.route('/')
 def index():
     """Main index page."""
@@ -149,11 +566,15 @@ def index():
         'endpoints': {
             'health': '/health - GET - Health check endpoint',
             'upload': '/upload - POST - Upload multiple images (form-data with "files" field)',
+            'upload_precheck': '/upload/precheck - POST - List which image hashes a session is missing',
             'preprocess': '/preprocess - POST - Preprocess images by session_id',
             'preprocess_results': '/preprocess/<session_id> - GET - Get preprocessing results',
             'process': '/process - POST - Start COLMAP 3D reconstruction processing',
             'status': '/status/<session_id> - GET - Get processing status (uploaded/processing/complete/error)',
+            'status_batch': '/status/batch - POST - Get processing status for a list of session_ids',
+            'status_stream': '/status/<session_id>/stream - GET - Stream status changes as server-sent events',
             'download': '/download/<session_id> - GET - Download processed 3D models',
+            'download_stream': '/download/<session_id>/stream - GET - Stream all output files as a ZIP',
             'colmap_process': '/colmap/process - POST - Start COLMAP 3D reconstruction',
             'colmap_status': '/colmap/status/<session_id> - GET - Get COLMAP processing status',
             'colmap_results': '/colmap/results/<session_id> - GET - Get COLMAP processing results',
@@ -176,38 +597,17 @@ def health_check():
         upload_dir_exists = os.path.exists(app.config['UPLOAD_FOLDER'])
         output_dir_exists = os.path.exists(app.config['OUTPUT_FOLDER'])
         
-        # Check OpenCV availability
-        opencv_available = True
-        try:
-            cv2.__version__
-        except Exception:
-            opencv_available = False
-        
-        # Check numpy availability
-        numpy_available = True
-        try:
-            np.__version__
-        except Exception:
-            numpy_available = False
-        
-        # Check COLMAP availability
-        colmap_available = colmap_processor is not None
-        
         health_status = {
             'status': 'healthy',
             'timestamp': datetime.utcnow().isoformat(),
             'services': {
                 'upload_directory': upload_dir_exists,
                 'output_directory': output_dir_exists,
-                'opencv': opencv_available,
-                'numpy': numpy_available,
-                'colmap': colmap_available
+                'opencv': True,  # Imported at module load
+                'numpy': True,
+                'colmap': colmap_processor is not None
             },
-            'versions': {
-                'opencv': cv2.__version__ if opencv_available else 'unavailable',
-                'numpy': np.__version__ if numpy_available else 'unavailable',
-                'colmap': 'available' if colmap_available else 'unavailable'
-            }
+            'versions': HEALTH_VERSIONS
         }
         
         # Overall health status
@@ -241,21 +641,50 @@ def upload_files():
         if not files or all(file.filename == '' for file in files):
             return jsonify({'error': 'No files selected'}), 400
         
-        # Generate unique session ID
-        session_id = str(uuid.uuid4())
-        session_dir = create_session_directory(session_id)
+        # Clients may upload a large set in batches: later batches name the
+        # session the first one created and add to it while it is unprocessed
+        session_id = request.form.get('session_id')
+        if session_id:
+            try:
+                session_id = str(uuid.UUID(session_id))
+            except ValueError:
+                return jsonify({'error': 'Invalid session_id'}), 400
+            session_dir = os.path.join(app.config['UPLOAD_FOLDER'], session_id)
+            session_status = get_session_status(session_id)
+            if session_status is None or not os.path.isdir(session_dir):
+                return jsonify({'error': f'Session {session_id} not found'}), 404
+            if session_status.status != 'uploaded':
+                return jsonify({'error': f'Session {session_id} is already {session_status.status}'}), 409
+        else:
+            # Generate unique session ID
+            session_id = str(uuid.uuid4())
+            session_dir = create_session_directory(session_id)
         
         uploaded_files = []
         failed_files = []
         total_size = 0
         
+        # Batches of one session pass the index of their first file and are named
+        # by that sequence alone: parallel batches finish in any order, and a
+        # per-request timestamp in front would break the capture order that
+        # sequential matching relies on. Single uploads keep a timestamp prefix.
+        sequence_start = request.form.get('sequence_start', type=int)
+        if sequence_start is None:
+            name_prefix = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_"
+            file_sequence = itertools.count()
+        else:
+            name_prefix = ''
+            file_sequence = itertools.count(sequence_start)
+        
         # Process each file
         for file in files:
             if file.filename == '':
                 continue
                 
-            # Validate file
-            is_valid, validation_message = validate_image_file(file)
+            # Validate the part where it was streamed to disk
+            temp_path = file.stream.name
+            file.stream.close()
+            is_valid, validation_message, file_size = validate_image_file(file.filename, temp_path)
             
             if not is_valid:
                 failed_files.append({
@@ -264,17 +693,13 @@ def upload_files():
                 })
                 continue
             
-            # Generate secure filename
+            # Generate secure filename; the sequence number keeps same-named files apart
             filename = secure_filename(file.filename)
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
-            unique_filename = f"{timestamp}{filename}"
+            unique_filename = f"{name_prefix}{next(file_sequence):06d}_{filename}"
             
-            # Save file to session directory
+            # Move the streamed file into the session directory
             filepath = os.path.join(session_dir, unique_filename)
-            file.save(filepath)
-            
-            # Get file size for response
-            file_size = os.path.getsize(filepath)
+            store_streamed_upload(temp_path, filepath, file_size)
             total_size += file_size
             
             uploaded_files.append({
@@ -303,7 +728,8 @@ def upload_files():
         
         # Initialize processing status for successful uploads
         if uploaded_files:
-            update_processing_status(session_id, 'uploaded', f'{len(uploaded_files)} files uploaded successfully')
+            session_file_count = len(os.listdir(session_dir))
+            update_processing_status(session_id, 'uploaded', f'{session_file_count} files uploaded successfully')
         
         # Determine response status code
         if uploaded_files:
@@ -322,11 +748,45 @@ def upload_files():
         logger.error(f"Upload error: {str(e)}")
         return jsonify({'error': 'Upload failed due to server error'}), 500
 
+
+UPLOAD_PRECHECK_MAX_HASHES = 5000
+# A quoted 32-character hex hash and separator take about 36 bytes
+JSON_BODY_LIMITS['upload_precheck'] = 48 * UPLOAD_PRECHECK_MAX_HASHES + 1024
+
+
+@app.route('/upload/precheck', methods=['POST'])
+def upload_precheck():
+    """Report which image content hashes a session does not have yet, so retries skip the rest."""
+    data = request.get_json(silent=True)
+    if not data or 'session_id' not in data or not isinstance(data.get('hashes'), list):
+        return jsonify({'error': 'session_id and a list of hashes are required'}), 400
+    if len(data['hashes']) > UPLOAD_PRECHECK_MAX_HASHES:
+        return jsonify({'error': f'At most {UPLOAD_PRECHECK_MAX_HASHES} hashes per request'}), 400
+    
+    try:
+        session_id = str(uuid.UUID(str(data['session_id'])))
+    except ValueError:
+        return jsonify({'error': 'Invalid session_id'}), 400
+    session_dir = os.path.join(app.config['UPLOAD_FOLDER'], session_id)
+    if not os.path.isdir(session_dir):
+        return jsonify({'error': f'Session {session_id} not found'}), 404
+    
+    stored = set()
+    for path in list_session_images(session_dir):
+        st = os.stat(path)
+        stored.add(cached_content_hash(path, st.st_mtime_ns, st.st_size))
+    missing = [content_hash for content_hash in data['hashes'] if content_hash not in stored]
+    return jsonify({
+        'session_id': session_id,
+        'missing': missing,
+        'present': len(data['hashes']) - len(missing)
+    })
+
 @app.route('/preprocess', methods=['POST'])
 def preprocess_images():
     """Preprocess uploaded images in a session."""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
         
         if not data or 'session_id' not in data:
             return jsonify({'error': 'No session_id provided'}), 400
@@ -343,16 +803,18 @@ def preprocess_images():
         
         logger.info(f"Starting preprocessing for session {session_id} with max_dimension={max_dimension}")
         
+        # List the session's images once and hand them over as a batch
+        image_files = list_session_images(session_dir)
+        
         # Initialize preprocessor and process images
         try:
-            preprocessor = ImagePreprocessor(max_dimension=max_dimension)
-            results = preprocessor.process_session_images(session_dir)
+            preprocessor = get_preprocessor(max_dimension)
+            results = preprocessor.process_batch(image_files, session_dir)
             
             # Save preprocessing results to session directory
             results_file = os.path.join(session_dir, 'preprocessing_results.json')
-            import json
             with open(results_file, 'w') as f:
-                json.dump(results, f, indent=2)
+                f.write(app.json.dumps(results))
             
             logger.info(f"Preprocessing completed for session {session_id}: "
                        f"{results['statistics']['processed_count']} processed, "
@@ -381,6 +843,27 @@ def preprocess_images():
         return jsonify({'error': 'Preprocessing request failed'}), 500
 
 
+def read_json_file(path):
+    """Parse a JSON file, letting orjson read straight from a memory map when available."""
+    with open(path, 'rb') as f:
+        if orjson is None or os.fstat(f.fileno()).st_size == 0:
+            return app.json.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            return orjson.loads(view)
+
+
+@lru_cache(maxsize=128)
+def preprocessing_results_body(session_id, results_file, mtime_ns, file_size):
+    """Build the JSON body for a results file, cached per (path, mtime, size) across polls."""
+    results = read_json_file(results_file)
+    
+    return app.json.dumps({
+        'session_id': session_id,
+        'preprocessing_results': results,
+        'results_file': results_file
+    })
+
+
 @app.route('/preprocess/<session_id>', methods=['GET'])
 def get_preprocessing_results(session_id):
     """Get preprocessing results for a session."""
@@ -393,65 +876,198 @@ def get_preprocessing_results(session_id):
         
         # Check if preprocessing results exist
         results_file = os.path.join(session_dir, 'preprocessing_results.json')
-        if not os.path.exists(results_file):
+        try:
+            results_stat = os.stat(results_file)
+        except FileNotFoundError:
             return jsonify({
                 'error': 'No preprocessing results found for this session',
                 'session_id': session_id,
                 'suggestion': 'Run POST /preprocess first'
             }), 404
         
-        # Load and return results
-        import json
-        with open(results_file, 'r') as f:
-            results = json.load(f)
+        # The results file only changes when preprocessing is re-run
+        etag = f"{results_stat.st_mtime_ns:x}-{results_stat.st_size:x}"
+        if request.if_none_match.contains(etag):
+            body = ''
+        else:
+            # Serve the cached body; a rewritten results file gets a new cache key
+            body = preprocessing_results_body(session_id, results_file, results_stat.st_mtime_ns, results_stat.st_size)
         
         logger.info(f"Retrieved preprocessing results for session {session_id}")
         
-        return jsonify({
-            'session_id': session_id,
-            'preprocessing_results': results,
-            'results_file': results_file
-        }), 200
+        response = app.response_class(body, mimetype=app.json.mimetype)
+        return conditional_json(response, etag=etag, last_modified=results_stat.st_mtime)
         
     except Exception as e:
         logger.error(f"Error retrieving preprocessing results for session {session_id}: {str(e)}")
         return jsonify({'error': 'Failed to retrieve preprocessing results'}), 500
 
 
-# Global dictionary to store processing status
+@dataclass(frozen=True)
+class SessionStatus:
+    """Immutable snapshot of a session's processing status."""
+    session_id: str
+    status: str = 'uploaded'
+    message: str = 'Session created'
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    error: Optional[str] = None
+    output_files: Tuple[Dict[str, Any], ...] = ()
+    model_processing_results: Optional[Dict[str, Any]] = None
+    download_manifest: Optional[Tuple[Dict[str, Any], ...]] = None
+    
+    def __post_init__(self):
+        # Snapshots are shared between threads without copying, so their
+        # sequences must not be lists a writer could still append to
+        object.__setattr__(self, 'output_files', tuple(self.output_files))
+        if self.download_manifest is not None:
+            object.__setattr__(self, 'download_manifest', tuple(self.download_manifest))
+    
+    @cached_property
+    def output_paths_by_name(self) -> Dict[str, str]:
+        """Output file paths keyed by file name, built once per snapshot."""
+        paths = {}
+        for file_info in self.output_files:
+            file_path = file_info.get('path', '')
+            if file_path:
+                paths.setdefault(os.path.basename(file_path), file_path)
+        return paths
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dictionary view for JSON responses and persistence."""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SessionStatus':
+        """Build a snapshot from a stored dictionary, ignoring unknown keys."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+# Global dictionary caching processing status, backed by the persistent status store.
+# Each session maps to a frozen SessionStatus: writers build a new snapshot and
+# swap it in with a single item assignment, so readers can fetch it without
+# taking a lock or copying. Only writers to the same session are serialized,
+# through one of a fixed set of lock shards.
 processing_status = {}
-processing_lock = threading.Lock()
+# When each cached snapshot was last written or read from the store (time.monotonic())
+status_cached_at = {}
+STATUS_EVICT_INTERVAL = 256  # Drop expired cached snapshots once per this many status writes
+status_write_count = itertools.count(1)
+STATUS_LOCK_SHARDS = 32  # power of two, so a mask picks the shard
+status_write_locks = [threading.Lock() for _ in range(STATUS_LOCK_SHARDS)]
+TERMINAL_STATUSES = ('complete', 'error')
 
-def update_processing_status(session_id, status, message=None, error=None, output_files=None):
+
+def status_write_lock(session_id):
+    """Get the lock that serializes status writes for a session."""
+    return status_write_locks[hash(session_id) & (STATUS_LOCK_SHARDS - 1)]
+
+
+def get_session_status(session_id):
+    """Get the current status snapshot for a session, or None if unknown."""
+    snapshot = processing_status.get(session_id)
+    now = time.monotonic()
+    if snapshot is not None and (snapshot.status in TERMINAL_STATUSES or
+                                 now - status_cached_at.get(session_id, 0.0) < app.config['STATUS_REFRESH_SECONDS']):
+        return snapshot
+    
+    # In-flight sessions may be updated by another process (e.g. a separate
+    # /preprocess instance), so re-read them from the store now and then
+    if status_store:
+        try:
+            stored = status_store.get(session_id)
+        except Exception as e:
+            logger.warning(f"Failed to read stored status for session {session_id}: {str(e)}")
+            stored = None
+        if stored is not None:
+            snapshot = SessionStatus.from_dict(stored)
+            processing_status[session_id] = snapshot
+        if snapshot is not None:
+            status_cached_at[session_id] = now
+    return snapshot
+
+
+def evict_expired_statuses():
+    """Drop cached snapshots not written or refreshed within STATUS_TTL_SECONDS."""
+    cutoff = time.monotonic() - app.config['STATUS_TTL_SECONDS']
+    expired = [session_id for session_id, cached_at in list(status_cached_at.items()) if cached_at < cutoff]
+    for session_id in expired:
+        with status_write_lock(session_id):
+            if status_cached_at.get(session_id, cutoff) < cutoff:
+                processing_status.pop(session_id, None)
+                status_cached_at.pop(session_id, None)
+    if expired:
+        logger.info(f"Evicted {len(expired)} expired session statuses from memory")
+
+
+def build_download_manifest(session_id, output_files):
+    """
+    Describe the output files of a session that can be downloaded.
+
+    Args:
+        session_id: Session the files belong to
+        output_files: Output file entries recorded for the session
+
+    Returns:
+        List of file descriptions with download URLs, for files that exist on disk
+    """
+    manifest = []
+    for file_info in output_files:
+        file_path = file_info.get('path', '')
+        if file_path and os.path.exists(file_path):
+            manifest.append({
+                'type': file_info.get('type', 'unknown'),
+                'format': file_info.get('format', 'unknown'),
+                'size': file_info.get('size', 0),
+                'download_url': f'/download/{session_id}/file/{os.path.basename(file_path)}',
+                'metadata': file_info.get('metadata', {})
+            })
+    return manifest
+
+
+def update_processing_status(session_id, status, message=None, error=None, output_files=None,
+                             model_processing_results=None):
     """Update processing status for a session."""
-    with processing_lock:
-        if session_id not in processing_status:
-            processing_status[session_id] = {
-                'session_id': session_id,
-                'status': 'uploaded',
-                'message': 'Session created',
-                'start_time': datetime.now().isoformat(),
-                'end_time': None,
-                'error': None,
-                'output_files': []
-            }
+    with status_write_lock(session_id):
+        current = get_session_status(session_id)
+        if current is None:
+            current = SessionStatus(session_id=session_id, start_time=datetime.now().isoformat())
         
-        processing_status[session_id]['status'] = status
+        changes = {'status': status}
         if message:
-            processing_status[session_id]['message'] = message
+            changes['message'] = message
         if error:
-            processing_status[session_id]['error'] = error
+            changes['error'] = error
         if output_files:
-            processing_status[session_id]['output_files'] = output_files
-        if status in ['complete', 'error']:
-            processing_status[session_id]['end_time'] = datetime.now().isoformat()
+            changes['output_files'] = output_files
+        if model_processing_results is not None:
+            changes['model_processing_results'] = model_processing_results
+        if status in TERMINAL_STATUSES:
+            changes['end_time'] = datetime.now().isoformat()
+        if status == 'complete':
+            # Outputs no longer change, so resolve the download list once here
+            changes['download_manifest'] = build_download_manifest(
+                session_id, changes.get('output_files', current.output_files))
+        
+        updated = replace(current, **changes)
+        processing_status[session_id] = updated
+        status_cached_at[session_id] = time.monotonic()
+        if status_store:
+            try:
+                status_store.put(session_id, updated.to_dict())
+            except Exception as e:
+                logger.warning(f"Failed to persist status for session {session_id}: {str(e)}")
+    
+    if next(status_write_count) % STATUS_EVICT_INTERVAL == 0:
+        evict_expired_statuses()
 
 
 @app.route('/process', methods=['POST'])
 def process_images():
     """Process uploaded images for photogrammetry using COLMAP."""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
         
         if not data or 'session_id' not in data:
             return jsonify({'error': 'No session_id provided'}), 400
@@ -471,11 +1087,7 @@ def process_images():
             }), 503
         
         # Get all image files from the session directory
-        image_files = []
-        for filename in os.listdir(session_dir):
-            filepath = os.path.join(session_dir, filename)
-            if os.path.isfile(filepath) and allowed_file(filename):
-                image_files.append(filepath)
+        image_files = list_session_images(session_dir)
         
         if not image_files:
             return jsonify({'error': 'No valid image files found in session'}), 404
@@ -496,7 +1108,17 @@ def process_images():
         enable_dense = data.get('enable_dense_reconstruction', False)
         enable_mesh = data.get('enable_meshing', False)
         max_image_size = data.get('max_image_size', 1920)
-        matcher_type = data.get('matcher_type', 'exhaustive')
+        matcher_type = resolve_matcher_type(data, len(image_files))
+        
+        # Per-run settings; the shared processor itself is never mutated
+        run_config = colmap_processor.run_config(
+            enable_dense_reconstruction=enable_dense,
+            enable_meshing=enable_mesh,
+            max_image_size=max_image_size,
+            matcher_type=matcher_type,
+            camera_model=data.get('camera_model'),
+            known_focal_length=data.get('known_focal_length')
+        )
         
         logger.info(f"Starting COLMAP processing for session {session_id} with {len(image_files)} images")
         
@@ -506,14 +1128,9 @@ def process_images():
                 # Update status to processing
                 update_processing_status(session_id, 'processing', 'Starting COLMAP 3D reconstruction')
                 
-                # Configure processor for this session
-                colmap_processor.enable_dense_reconstruction = enable_dense
-                colmap_processor.enable_meshing = enable_mesh
-                colmap_processor.max_image_size = max_image_size
-                colmap_processor.matcher_type = matcher_type.lower()
-                
                 # Run COLMAP processing (synchronous mode)
-                results = colmap_processor.process_images(session_id, image_files, async_mode=False)
+                results = colmap_processor.process_images(session_id, image_files, async_mode=False,
+                                                          config=run_config)
                 
                 if results.get('status') == 'completed':
                     # Process 3D models for download
@@ -559,31 +1176,30 @@ def process_images():
                             output_files.extend(colmap_output_files)
                         elif isinstance(colmap_output_files, dict):
                             # Legacy format: dict with file types as keys
+                            candidates = []
                             for file_type, file_info in colmap_output_files.items():
-                                if file_info:
-                                    if isinstance(file_info, dict):
-                                        for sub_type, sub_path in file_info.items():
-                                            if sub_path and os.path.exists(sub_path):
-                                                output_files.append({
-                                                    'type': f"{file_type}_{sub_type}",
-                                                    'path': sub_path,
-                                                    'size': os.path.getsize(sub_path)
-                                                })
-                                    elif isinstance(file_info, str) and os.path.exists(file_info):
-                                        output_files.append({
-                                            'type': file_type,
-                                            'path': file_info,
-                                            'size': os.path.getsize(file_info)
-                                        })
+                                if isinstance(file_info, dict):
+                                    candidates.extend((f"{file_type}_{sub_type}", sub_path)
+                                                      for sub_type, sub_path in file_info.items() if sub_path)
+                                elif file_info and isinstance(file_info, str):
+                                    candidates.append((file_type, file_info))
+                            output_files.extend(existing_output_files(candidates))
                     
-                    # Store model processing results in status
-                    processing_status[session_id]['model_processing_results'] = model_processing_results
+                    # Compress text outputs now so the first viewer request does not pay for it
+                    for file_info in output_files:
+                        file_path = file_info.get('path', '')
+                        if file_path and mime_type_for(file_path, VIEW_MIME_TYPES) in COMPRESSIBLE_MIME_TYPES:
+                            try:
+                                gzip_sibling(file_path)
+                            except OSError as e:
+                                logger.warning(f"Could not pre-compress {file_path}: {str(e)}")
                     
                     update_processing_status(
                         session_id,
                         'complete',
                         'Processing completed successfully with downloadable models',
-                        output_files=output_files
+                        output_files=output_files,
+                        model_processing_results=model_processing_results
                     )
                     logger.info(f"Complete processing finished for session {session_id}")
                 else:
@@ -596,14 +1212,9 @@ def process_images():
                 update_processing_status(session_id, 'error', error=error_msg)
                 logger.error(f"COLMAP background processing failed for session {session_id}: {str(e)}")
         
-        # Start background processing
-        import threading
-        processing_thread = threading.Thread(target=process_in_background)
-        processing_thread.daemon = True
-        processing_thread.start()
-        
-        # Update status to processing
-        update_processing_status(session_id, 'processing', 'COLMAP processing started')
+        # Queue background processing on the shared job pool
+        update_processing_status(session_id, 'processing', 'COLMAP processing queued')
+        processing_executor.submit(process_in_background)
         
         return jsonify({
             'message': 'Processing started',
@@ -627,67 +1238,172 @@ def process_images():
         return jsonify({'error': error_msg}), 500
 
 
+def build_status_data(session_id, session_status):
+    """Build the status response for a session, with COLMAP stage details when available."""
+    status_data = session_status.to_dict()
+    
+    # Add additional details if available from COLMAP processor
+    if colmap_processor:
+        colmap_progress = colmap_processor.get_progress(session_id)
+        if colmap_progress:
+            stage = colmap_progress.get('stage', 'unknown')
+            # Convert enum to string if it's an enum
+            if hasattr(stage, 'value'):
+                stage = stage.value
+            status_data['detailed_progress'] = {
+                'stage': stage,
+                'progress_percent': colmap_progress.get('progress_percent', 0),
+                'stage_message': colmap_progress.get('message', '')
+            }
+    
+    return status_data
+
+
 @app.route('/status/<session_id>', methods=['GET'])
 def get_processing_status(session_id):
     """Get processing status for a session."""
     try:
-        with processing_lock:
-            if session_id not in processing_status:
-                return jsonify({
-                    'error': f'No processing status found for session {session_id}',
-                    'suggestion': 'Start processing with POST /process'
-                }), 404
-            
-            status_data = processing_status[session_id].copy()
-        
-        # Add additional details if available from COLMAP processor
-        if colmap_processor:
-            colmap_progress = colmap_processor.get_progress(session_id)
-            if colmap_progress:
-                stage = colmap_progress.get('stage', 'unknown')
-                # Convert enum to string if it's an enum
-                if hasattr(stage, 'value'):
-                    stage = stage.value
-                status_data['detailed_progress'] = {
-                    'stage': stage,
-                    'progress_percent': colmap_progress.get('progress_percent', 0),
-                    'stage_message': colmap_progress.get('message', '')
-                }
+        session_status = get_session_status(session_id)
+        if session_status is None:
+            return jsonify({
+                'error': f'No processing status found for session {session_id}',
+                'suggestion': 'Start processing with POST /process'
+            }), 404
+        
+        status_data = build_status_data(session_id, session_status)
         
-        logger.info(f"Retrieved status for session {session_id}: {status_data['status']}")
+        logger.info(f"Retrieved status for session {session_id}: {session_status.status}")
         
-        return jsonify(status_data), 200
+        return conditional_json(jsonify(status_data))
         
     except Exception as e:
         logger.error(f"Error retrieving status for session {session_id}: {str(e)}")
         return jsonify({'error': 'Failed to retrieve processing status'}), 500
 
 
+# Most sessions one /status/batch request may ask about
+STATUS_BATCH_MAX_SESSIONS = 500
+# A quoted UUID and separator take about 40 bytes
+JSON_BODY_LIMITS['get_batch_processing_status'] = 64 * STATUS_BATCH_MAX_SESSIONS + 1024
+
+
+@app.route('/status/batch', methods=['POST'])
+def get_batch_processing_status():
+    """Get processing status for several sessions in one request; unknown sessions map to null."""
+    data = request.get_json(silent=True)
+    session_ids = data.get('session_ids') if isinstance(data, dict) else None
+    if not isinstance(session_ids, list):
+        return jsonify({'error': 'session_ids must be a list'}), 400
+    if len(session_ids) > STATUS_BATCH_MAX_SESSIONS:
+        return jsonify({'error': f'At most {STATUS_BATCH_MAX_SESSIONS} sessions per request'}), 400
+    
+    statuses = {}
+    for session_id in dict.fromkeys(str(session_id) for session_id in session_ids):
+        session_status = get_session_status(session_id)
+        statuses[session_id] = build_status_data(session_id, session_status) if session_status else None
+    
+    return jsonify({'statuses': statuses})
+
+
+# Server-side check interval and idle keepalive period for status event streams (seconds)
+STATUS_STREAM_INTERVAL = 0.5
+STATUS_STREAM_KEEPALIVE = 15.0
+# Each open stream holds a server thread, so streams end after this long and
+# clients reconnect; jobs can run for hours
+STATUS_STREAM_MAX_SECONDS = 300.0
+STATUS_STREAM_RETRY_MS = 1000
+
+
+@app.route('/status/<session_id>/stream', methods=['GET'])
+def stream_processing_status(session_id):
+    """
+    Stream status changes for a session as server-sent events until it finishes.
+
+    A stream closes after STATUS_STREAM_MAX_SECONDS to free its thread. Each
+    event carries an id derived from its payload; a client reconnecting with
+    that id in Last-Event-ID resumes without being sent the same status again.
+    """
+    if get_session_status(session_id) is None:
+        return jsonify({
+            'error': f'No processing status found for session {session_id}',
+            'suggestion': 'Start processing with POST /process'
+        }), 404
+    
+    # A reconnecting client names the last event it received
+    resume_event_id = request.headers.get('Last-Event-ID')
+    
+    def generate():
+        # The status lookup is an in-process read, so checking it here replaces a
+        # client round trip per poll; only changes go over the wire
+        last_event_id = resume_event_id
+        last_payload = None
+        last_sent = time.monotonic()
+        closes_at = last_sent + STATUS_STREAM_MAX_SECONDS
+        yield f"retry: {STATUS_STREAM_RETRY_MS}\n\n"
+        while True:
+            session_status = get_session_status(session_id)
+            if session_status is None:
+                return
+            
+            payload = app.json.dumps(build_status_data(session_id, session_status))
+            now = time.monotonic()
+            if payload != last_payload:
+                event_id = hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
+                if event_id != last_event_id:
+                    yield f"id: {event_id}\ndata: {payload}\n\n"
+                    last_event_id = event_id
+                    last_sent = now
+                last_payload = payload
+            elif now - last_sent >= STATUS_STREAM_KEEPALIVE:
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                last_sent = now
+            
+            if session_status.status in TERMINAL_STATUSES or now >= closes_at:
+                return
+            time.sleep(STATUS_STREAM_INTERVAL)
+    
+    def generate_gzip():
+        # Sync-flush after every event so the client can decode it as soon as it arrives
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for event in generate():
+            yield compressor.compress(event.encode('utf-8')) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+    
+    if 'gzip' in request.accept_encodings:
+        response = Response(generate_gzip(), mimetype='text/event-stream')
+        response.content_encoding = 'gzip'
+    else:
+        response = Response(generate(), mimetype='text/event-stream')
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Deliver events through nginx unbuffered
+    return response
+
+
 @app.route('/download/<session_id>', methods=['GET'])
 def download_models(session_id):
     """Download processed 3D models for a session."""
     try:
         # Check if session exists in processing status
-        with processing_lock:
-            if session_id not in processing_status:
-                return jsonify({
-                    'error': f'No processing found for session {session_id}',
-                    'suggestion': 'Start processing with POST /process'
-                }), 404
-            
-            session_status = processing_status[session_id].copy()
+        session_status = get_session_status(session_id)
+        if session_status is None:
+            return jsonify({
+                'error': f'No processing found for session {session_id}',
+                'suggestion': 'Start processing with POST /process'
+            }), 404
         
         # Check if processing is completed
-        if session_status['status'] != 'complete':
+        if session_status.status != 'complete':
             return jsonify({
                 'error': 'Processing not completed yet',
-                'current_status': session_status['status'],
-                'message': session_status.get('message', ''),
+                'current_status': session_status.status,
+                'message': session_status.message,
                 'status_endpoint': f'/status/{session_id}'
             }), 400
         
         # Get model processing results
-        model_results = session_status.get('model_processing_results')
+        model_results = session_status.model_processing_results
         if not model_results:
             return jsonify({
                 'error': 'No processed models available for download',
@@ -699,15 +1415,15 @@ def download_models(session_id):
         if compressed_archive and os.path.exists(compressed_archive):
             logger.info(f"Serving compressed model archive for session {session_id}")
             
-            return send_file(
+            return send_output_file(
                 compressed_archive,
+                mimetype='application/zip',
                 as_attachment=True,
-                download_name=f"3d_model_{session_id}.zip",
-                mimetype='application/zip'
+                download_name=f"3d_model_{session_id}.zip"
             )
         
         # If no compressed archive, check for individual files
-        output_files = session_status.get('output_files', [])
+        output_files = session_status.output_files
         if not output_files:
             return jsonify({
                 'error': 'No output files available for download'
@@ -715,17 +1431,9 @@ def download_models(session_id):
         
         # For individual file download, return information about available files
         # In a more complete implementation, you might want to create a zip on-the-fly
-        available_files = []
-        for file_info in output_files:
-            file_path = file_info.get('path', '')
-            if file_path and os.path.exists(file_path):
-                available_files.append({
-                    'type': file_info.get('type', 'unknown'),
-                    'format': file_info.get('format', 'unknown'),
-                    'size': file_info.get('size', 0),
-                    'download_url': f'/download/{session_id}/file/{os.path.basename(file_path)}',
-                    'metadata': file_info.get('metadata', {})
-                })
+        available_files = session_status.download_manifest
+        if available_files is None:
+            available_files = build_download_manifest(session_id, output_files)
         
         if not available_files:
             return jsonify({
@@ -750,34 +1458,122 @@ def download_models(session_id):
         return jsonify({'error': 'Failed to process download request'}), 500
 
 
+# Outputs that are already compressed are stored as-is rather than deflated again
+STORED_ZIP_EXTENSIONS = ('.zip', '.gz', '.glb', '.jpg', '.jpeg', '.png')
+ZIP_STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+class ZipChunkWriter(io.RawIOBase):
+    """Unseekable sink that collects what zipfile writes so it can be yielded to the client."""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        """Return and clear the bytes written since the last drain."""
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_zip(files):
+    """
+    Generate a ZIP archive incrementally, without writing it to disk.
+
+    Args:
+        files: Iterable of (path, archive_name) pairs
+
+    Yields:
+        Chunks of the archive as they are produced
+    """
+    sink = ZipChunkWriter()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for path, archive_name in files:
+            compress_type = zipfile.ZIP_STORED if path.lower().endswith(STORED_ZIP_EXTENSIONS) \
+                else zipfile.ZIP_DEFLATED
+            info = zipfile.ZipInfo.from_file(path, archive_name)
+            info.compress_type = compress_type
+            with open(path, 'rb') as src, archive.open(info, 'w', force_zip64=True) as dest:
+                while chunk := src.read(ZIP_STREAM_CHUNK_SIZE):
+                    dest.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+    yield sink.drain()
+
+
+@app.route('/download/<session_id>/stream', methods=['GET'])
+def download_stream(session_id):
+    """Stream all output files of a session as a ZIP built on the fly."""
+    try:
+        session_status = get_session_status(session_id)
+        if session_status is None:
+            return jsonify({
+                'error': f'No processing found for session {session_id}'
+            }), 404
+        
+        if session_status.status != 'complete':
+            return jsonify({
+                'error': 'Processing not completed yet'
+            }), 400
+        
+        files = []
+        archive_names = set()
+        for file_info in session_status.output_files:
+            file_path = file_info.get('path', '')
+            archive_name = os.path.basename(file_path)
+            if file_path and archive_name not in archive_names and os.path.isfile(file_path):
+                archive_names.add(archive_name)
+                files.append((file_path, archive_name))
+        
+        if not files:
+            return jsonify({
+                'error': 'No downloadable files found'
+            }), 404
+        
+        logger.info(f"Streaming {len(files)} output files as ZIP for session {session_id}")
+        
+        response = Response(stream_zip(files), mimetype='application/zip')
+        response.headers.set('Content-Disposition', 'attachment', filename=f"3d_model_{session_id}.zip")
+        return response
+        
+    except Exception as e:
+        logger.error(f"Error streaming download for session {session_id}: {str(e)}")
+        return jsonify({'error': 'Failed to stream download'}), 500
+
+
 @app.route('/download/<session_id>/file/<filename>', methods=['GET'])
 def download_individual_file(session_id, filename):
     """Download an individual file from a processing session."""
     try:
         # Check if session exists and is completed
-        with processing_lock:
-            if session_id not in processing_status:
-                return jsonify({
-                    'error': f'No processing found for session {session_id}'
-                }), 404
-            
-            session_status = processing_status[session_id].copy()
+        session_status = get_session_status(session_id)
+        if session_status is None:
+            return jsonify({
+                'error': f'No processing found for session {session_id}'
+            }), 404
         
-        if session_status['status'] != 'complete':
+        if session_status.status != 'complete':
             return jsonify({
                 'error': 'Processing not completed yet'
             }), 400
         
         # Find the requested file
-        output_files = session_status.get('output_files', [])
-        target_file = None
-        
-        for file_info in output_files:
-            file_path = file_info.get('path', '')
-            if file_path and os.path.basename(file_path) == filename:
-                if os.path.exists(file_path):
-                    target_file = file_path
-                    break
+        output_files = session_status.output_files
+        target_file = session_status.output_paths_by_name.get(filename)
+        if target_file and not os.path.exists(target_file):
+            target_file = None
         
         if not target_file:
             return jsonify({
@@ -785,26 +1581,15 @@ def download_individual_file(session_id, filename):
                 'available_files': [os.path.basename(f.get('path', '')) for f in output_files if f.get('path')]
             }), 404
         
-        # Determine MIME type based on file extension
-        file_ext = os.path.splitext(filename)[1].lower()
-        mime_types = {
-            '.obj': 'model/obj',
-            '.ply': 'application/octet-stream',
-            '.mtl': 'text/plain',
-            '.txt': 'text/plain',
-            '.json': 'application/json',
-            '.zip': 'application/zip'
-        }
-        
-        mime_type = mime_types.get(file_ext, 'application/octet-stream')
+        mime_type = mime_type_for(filename, DOWNLOAD_MIME_TYPES)
         
         logger.info(f"Serving individual file {filename} for session {session_id}")
         
-        return send_file(
+        return send_output_file(
             target_file,
+            mimetype=mime_type,
             as_attachment=True,
-            download_name=filename,
-            mimetype=mime_type
+            download_name=filename
         )
         
     except Exception as e:
@@ -817,29 +1602,22 @@ def serve_file_for_viewing(session_id, filename):
     """Serve a file for inline viewing (e.g., 3D model viewer)."""
     try:
         # Check if session exists and is completed
-        with processing_lock:
-            if session_id not in processing_status:
-                return jsonify({
-                    'error': f'No processing found for session {session_id}'
-                }), 404
-            
-            session_status = processing_status[session_id].copy()
+        session_status = get_session_status(session_id)
+        if session_status is None:
+            return jsonify({
+                'error': f'No processing found for session {session_id}'
+            }), 404
         
-        if session_status['status'] != 'complete':
+        if session_status.status != 'complete':
             return jsonify({
                 'error': 'Processing not completed yet'
             }), 400
         
         # Find the requested file
-        output_files = session_status.get('output_files', [])
-        target_file = None
-        
-        for file_info in output_files:
-            file_path = file_info.get('path', '')
-            if file_path and os.path.basename(file_path) == filename:
-                if os.path.exists(file_path):
-                    target_file = file_path
-                    break
+        output_files = session_status.output_files
+        target_file = session_status.output_paths_by_name.get(filename)
+        if target_file and not os.path.exists(target_file):
+            target_file = None
         
         if not target_file:
             return jsonify({
@@ -847,29 +1625,12 @@ def serve_file_for_viewing(session_id, filename):
                 'available_files': [os.path.basename(f.get('path', '')) for f in output_files if f.get('path')]
             }), 404
         
-        # Determine MIME type based on file extension
-        file_ext = os.path.splitext(filename)[1].lower()
-        mime_types = {
-            '.obj': 'model/obj',
-            '.ply': 'application/octet-stream',
-            '.gltf': 'model/gltf+json',
-            '.glb': 'model/gltf-binary',
-            '.fbx': 'application/octet-stream',
-            '.mtl': 'text/plain',
-            '.txt': 'text/plain',
-            '.json': 'application/json'
-        }
-        
-        mime_type = mime_types.get(file_ext, 'application/octet-stream')
+        mime_type = mime_type_for(filename, VIEW_MIME_TYPES)
         
         logger.info(f"Serving file {filename} for viewing in session {session_id}")
         
         # Serve file inline for viewing
-        return send_file(
-            target_file,
-            as_attachment=False,  # Serve inline for viewing
-            mimetype=mime_type
-        )
+        return send_output_file(target_file, mimetype=mime_type)
         
     except Exception as e:
         logger.error(f"Error serving file {filename} for viewing in session {session_id}: {str(e)}")
@@ -887,7 +1648,7 @@ def colmap_process():
                 'details': 'COLMAP may not be installed or configured properly'
             }), 503
         
-        data = request.get_json()
+        data = request.get_json(silent=True)
         
         if not data or 'session_id' not in data:
             return jsonify({'error': 'No session_id provided'}), 400
@@ -900,11 +1661,7 @@ def colmap_process():
             return jsonify({'error': f'Session {session_id} not found'}), 404
         
         # Get all image files from the session directory
-        image_files = []
-        for filename in os.listdir(session_dir):
-            filepath = os.path.join(session_dir, filename)
-            if os.path.isfile(filepath) and allowed_file(filename):
-                image_files.append(filepath)
+        image_files = list_session_images(session_dir)
         
         if not image_files:
             return jsonify({'error': 'No valid image files found in session'}), 404
@@ -921,28 +1678,34 @@ def colmap_process():
         enable_dense = data.get('enable_dense_reconstruction', False)
         enable_mesh = data.get('enable_meshing', False)
         max_image_size = data.get('max_image_size', 1920)
-        matcher_type = data.get('matcher_type', 'exhaustive')
-        
-        # Update processor configuration for this session
-        colmap_processor.enable_dense_reconstruction = enable_dense
-        colmap_processor.enable_meshing = enable_mesh
-        colmap_processor.max_image_size = max_image_size
-        colmap_processor.matcher_type = matcher_type.lower()
+        matcher_type = resolve_matcher_type(data, len(image_files))
+        
+        # Per-run settings; the shared processor itself is never mutated
+        run_config = colmap_processor.run_config(
+            enable_dense_reconstruction=enable_dense,
+            enable_meshing=enable_mesh,
+            max_image_size=max_image_size,
+            matcher_type=matcher_type,
+            camera_model=data.get('camera_model'),
+            known_focal_length=data.get('known_focal_length')
+        )
         
         logger.info(f"Starting COLMAP processing for session {session_id} with {len(image_files)} images")
         
         # Start processing in a separate thread to avoid blocking
         def process_in_background():
             try:
-                results = colmap_processor.process_images(session_id, image_files, async_mode=False)
+                results = colmap_processor.process_images(session_id, image_files, async_mode=False,
+                                                          config=run_config)
                 logger.info(f"COLMAP processing completed for session {session_id}")
             except Exception as e:
                 logger.error(f"COLMAP background processing failed for session {session_id}: {str(e)}")
         
-        import threading
-        processing_thread = threading.Thread(target=process_in_background)
-        processing_thread.daemon = True
-        processing_thread.start()
+        # Queue on the shared job pool so concurrent requests cannot oversubscribe COLMAP
+        future = processing_executor.submit(process_in_background)
+        colmap_jobs[session_id] = future
+        future.add_done_callback(
+            lambda done: colmap_jobs.pop(session_id) if colmap_jobs.get(session_id) is done else None)
         
         return jsonify({
             'message': 'COLMAP processing started',
@@ -974,34 +1737,30 @@ def colmap_status(session_id):
         
         progress = colmap_processor.get_progress(session_id)
         
+        if not progress and session_id in colmap_jobs:
+            return jsonify({
+                'session_id': session_id,
+                'colmap_progress': {
+                    'session_id': session_id,
+                    'stage': 'initialization',
+                    'status': 'pending',
+                    'progress_percent': 0.0,
+                    'message': 'Waiting for a free processing slot'
+                }
+            }), 200
+        
         if not progress:
             return jsonify({
                 'error': f'No COLMAP processing found for session {session_id}',
                 'suggestion': 'Start processing with POST /colmap/process'
             }), 404
         
-        # Note: datetime objects are already converted to ISO strings in get_progress()
-        # No additional conversion needed for start_time and end_time
-        
-        # Convert enum objects to strings for JSON serialization
-        def serialize_for_json(obj):
-            """Recursively convert enum objects to JSON-serializable values."""
-            if hasattr(obj, 'value'):  # Handle enum objects
-                return obj.value
-            elif isinstance(obj, dict):
-                return {k: serialize_for_json(v) for k, v in obj.items()}
-            elif isinstance(obj, (list, tuple)):
-                return [serialize_for_json(item) for item in obj]
-            else:
-                return obj
-        
-        serializable_progress = serialize_for_json(progress)
-        
+        # Enum values left in the progress data are unwrapped by the JSON provider
         logger.info(f"Retrieved COLMAP status for session {session_id}: {progress['status']}")
         
         return jsonify({
             'session_id': session_id,
-            'colmap_progress': serializable_progress
+            'colmap_progress': progress
         }), 200
         
     except Exception as e:
@@ -1009,6 +1768,79 @@ def colmap_status(session_id):
         return jsonify({'error': 'Failed to retrieve processing status'}), 500
 
 
+# Discovered COLMAP output layout per session: session_id -> (timestamp, output_files).
+# Completed workspaces do not change until cleanup, so /colmap/results polls
+# reuse the last scan for a short while instead of re-checking every path.
+results_layout_cache = {}
+RESULTS_LAYOUT_TTL_SECONDS = 2.0
+
+
+def file_names_in(directory):
+    """Names of the regular files in a directory, or an empty set if it does not exist."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    except FileNotFoundError:
+        return set()
+
+
+def colmap_output_layout(session_id, workspace_dir):
+    """
+    Find the COLMAP output files in a session workspace.
+
+    Args:
+        session_id: Session the workspace belongs to (cache key)
+        workspace_dir: COLMAP workspace directory
+
+    Returns:
+        Dictionary of available output files, or None if the workspace does not exist
+    """
+    cached = results_layout_cache.get(session_id)
+    if cached is not None and time.monotonic() - cached[0] < RESULTS_LAYOUT_TTL_SECONDS:
+        return cached[1]
+    
+    # One listing of the workspace tells which stage directories exist, so
+    # stages that never ran (dense, mesh) cost no further lookups
+    try:
+        with os.scandir(workspace_dir) as entries:
+            stage_dirs = {entry.name for entry in entries if entry.is_dir()}
+    except (FileNotFoundError, NotADirectoryError):
+        results_layout_cache.pop(session_id, None)
+        return None
+    
+    output_files = {}
+    
+    # Sparse reconstruction results
+    model_dir = None
+    if "sparse" in stage_dirs:
+        with os.scandir(os.path.join(workspace_dir, "sparse")) as entries:
+            model_dir = next((entry.path for entry in entries if entry.is_dir()), None)
+    if model_dir:
+        present = file_names_in(model_dir)
+        output_files['sparse_model'] = {
+            name: os.path.join(model_dir, f'{name}.txt') if f'{name}.txt' in present else None
+            for name in ('cameras', 'images', 'points3D')
+        }
+    
+    # Dense reconstruction results
+    dense_dir = os.path.join(workspace_dir, "dense")
+    if "dense" in stage_dirs and 'fused.ply' in file_names_in(dense_dir):
+        output_files['dense_pointcloud'] = os.path.join(dense_dir, "fused.ply")
+    
+    # Mesh results
+    mesh_dir = os.path.join(workspace_dir, "mesh")
+    if "mesh" in stage_dirs and 'mesh.ply' in file_names_in(mesh_dir):
+        output_files['mesh'] = os.path.join(mesh_dir, "mesh.ply")
+    
+    # Drop expired scans of other sessions so the cache only holds recent polls
+    now = time.monotonic()
+    for key, (scanned_at, _) in list(results_layout_cache.items()):
+        if now - scanned_at >= RESULTS_LAYOUT_TTL_SECONDS:
+            results_layout_cache.pop(key, None)
+    results_layout_cache[session_id] = (now, output_files)
+    return output_files
+
+
 @app.route('/colmap/results/<session_id>', methods=['GET'])
 def colmap_results(session_id):
     """Get COLMAP processing results for a session."""
@@ -1039,61 +1871,23 @@ def colmap_results(session_id):
         # Get workspace directory to find output files
         workspace_dir = os.path.join(app.config['OUTPUT_FOLDER'], f"colmap_session_{session_id}")
         
-        if not os.path.exists(workspace_dir):
+        output_files = colmap_output_layout(session_id, workspace_dir)
+        if output_files is None:
             return jsonify({
                 'error': 'Results directory not found',
                 'session_id': session_id
             }), 404
         
-        # Collect available output files
-        output_files = {}
-        
-        # Sparse reconstruction results
-        sparse_dir = os.path.join(workspace_dir, "sparse")
-        if os.path.exists(sparse_dir):
-            sparse_models = [d for d in os.listdir(sparse_dir) if os.path.isdir(os.path.join(sparse_dir, d))]
-            if sparse_models:
-                model_dir = os.path.join(sparse_dir, sparse_models[0])
-                output_files['sparse_model'] = {
-                    'cameras': os.path.join(model_dir, 'cameras.txt') if os.path.exists(os.path.join(model_dir, 'cameras.txt')) else None,
-                    'images': os.path.join(model_dir, 'images.txt') if os.path.exists(os.path.join(model_dir, 'images.txt')) else None,
-                    'points3D': os.path.join(model_dir, 'points3D.txt') if os.path.exists(os.path.join(model_dir, 'points3D.txt')) else None
-                }
-        
-        # Dense reconstruction results
-        dense_ply = os.path.join(workspace_dir, "dense", "fused.ply")
-        if os.path.exists(dense_ply):
-            output_files['dense_pointcloud'] = dense_ply
-        
-        # Mesh results
-        mesh_ply = os.path.join(workspace_dir, "mesh", "mesh.ply")
-        if os.path.exists(mesh_ply):
-            output_files['mesh'] = mesh_ply
-        
         logger.info(f"Retrieved COLMAP results for session {session_id}")
         
-        # Convert enum objects to strings for JSON serialization
-        def serialize_for_json(obj):
-            """Recursively convert enum objects to JSON-serializable values."""
-            if hasattr(obj, 'value'):  # Handle enum objects
-                return obj.value
-            elif isinstance(obj, dict):
-                return {k: serialize_for_json(v) for k, v in obj.items()}
-            elif isinstance(obj, (list, tuple)):
-                return [serialize_for_json(item) for item in obj]
-            else:
-                return obj
-        
-        serializable_progress = serialize_for_json(progress)
-        
-        # Prepare response data with careful serialization
+        # Enum values left in the progress data are unwrapped by the JSON provider
         response_data = {
             'session_id': session_id,
             'status': 'completed',
-            'processing_time': serialize_for_json(progress.get('end_time') or progress.get('start_time')),
+            'processing_time': progress.get('end_time') or progress.get('start_time'),
             'workspace_directory': workspace_dir,
-            'output_files': serialize_for_json(output_files),
-            'colmap_progress': serializable_progress
+            'output_files': output_files,
+            'colmap_progress': progress
         }
         
         return jsonify(response_data), 200
@@ -1112,7 +1906,10 @@ def colmap_cancel(session_id):
                 'error': 'COLMAP processor not available'
             }), 503
         
-        success = colmap_processor.cancel_processing(session_id)
+        queued_job = colmap_jobs.get(session_id)
+        success = (queued_job is not None and queued_job.cancel()) or \
+            colmap_processor.cancel_processing(session_id)
+        results_layout_cache.pop(session_id, None)
         
         if success:
             logger.info(f"COLMAP processing cancelled for session {session_id}")
@@ -1141,9 +1938,11 @@ def colmap_cleanup(session_id):
                 'error': 'COLMAP processor not available'
             }), 503
         
-        force_cleanup = request.get_json().get('force', False) if request.get_json() else False
+        body = request.get_json(silent=True) or {}
+        force_cleanup = bool(body.get('force', False))
         
         success = colmap_processor.cleanup_session_data(session_id, force=force_cleanup)
+        results_layout_cache.pop(session_id, None)
         
         if success:
             logger.info(f"COLMAP session data cleaned up for session {session_id}")
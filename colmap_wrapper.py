@@ -13,21 +13,63 @@ Features:
 """
 
 import os
+import re
 import sys
 import json
+import math
+import hashlib
 import time
 import shutil
 import zipfile
 import logging
 import subprocess
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any, Union
-from dataclasses import dataclass, asdict
+from typing import Dict, List, NamedTuple, Optional, Tuple, Any, Union
+from dataclasses import dataclass, asdict, replace
 from enum import Enum
 import uuid
 from datetime import datetime
 
+# Use orjson for the archive metadata when installed - fall back to the json module otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Pillow downscales oversized inputs at staging and reads image sizes for known
+# camera intrinsics; without it images are staged as-is and intrinsics estimated
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+# Counters COLMAP prints while extracting and matching: "Processed file [42/128]",
+# "Matching image [3/100]", or "Matching block [3/16, 5/16]" for exhaustive matching
+COLMAP_PROGRESS_PATTERN = re.compile(rb'\[(\d+)/(\d+)(?:, (\d+)/(\d+))?\]')
+
+
+def _now_iso() -> str:
+    """Current local time as an ISO 8601 string; progress timestamps only need seconds."""
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _available_memory() -> int:
+    """Bytes of memory available without swapping, or 0 if it cannot be determined."""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return 0
+
 
 class ProcessingStage(Enum):
     """Enumeration of COLMAP processing stages."""
@@ -51,9 +93,21 @@ class ProcessingStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+class OutputFile(NamedTuple):
+    """A model file produced by a processing run."""
+    type: str
+    path: str
+
+
+@dataclass(slots=True)
 class ColmapProgress:
-    """Progress tracking for COLMAP processing."""
+    """
+    Progress tracking for COLMAP processing.
+    
+    Records are replaced rather than modified once published (see
+    ColmapProcessor._update_progress), so readers never need a lock.
+    slots=True (Python 3.10+) keeps the many short-lived records small.
+    """
     session_id: str
     stage: ProcessingStage
     status: ProcessingStatus
@@ -62,13 +116,25 @@ class ColmapProgress:
     start_time: Optional[str] = None
     end_time: Optional[str] = None
     error_message: Optional[str] = None
-    output_files: List[Dict[str, Any]] = None
+    output_files: List[OutputFile] = None
+    last_emit_ns: int = 0  # time.monotonic_ns() when this record was published
     
     def __post_init__(self):
         if self.output_files is None:
             self.output_files = []
 
 
+@dataclass
+class ColmapRunConfig:
+    """Reconstruction settings for a single processing run."""
+    enable_dense_reconstruction: bool = False
+    enable_meshing: bool = False
+    max_image_size: int = 1920
+    matcher_type: str = "exhaustive"
+    camera_model: Optional[str] = None
+    known_focal_length: Optional[float] = None
+
+
 class ColmapError(Exception):
     """Custom exception for COLMAP processing errors."""
     pass
@@ -85,6 +151,27 @@ class ColmapProcessor:
     - Mesh generation (optional)
     """
     
+    # Above this many images the mapper switches to COLMAP's faster global
+    # bundle adjustment schedule; the defaults are tuned for small datasets
+    FAST_MAPPER_MIN_IMAGES = 500
+    # Above this many images "auto" matching uses the vocabulary tree matcher
+    VOCAB_TREE_MIN_IMAGES = 300
+    # Vocabulary tree picked up when none is configured (download from the COLMAP website)
+    DEFAULT_VOCAB_TREE_PATH = Path.home() / ".cache" / "colmap_wrapper" / "vocab_tree_flickr100K_words32K.bin"
+    # Minimum interval between progress updates within one stage
+    PROGRESS_THROTTLE_NS = 100_000_000
+    # Commands that run on the GPU when use_gpu is set; each uses every GPU in gpu_indices
+    GPU_COMMANDS = frozenset({"feature_extractor", "exhaustive_matcher", "sequential_matcher",
+                              "vocab_tree_matcher", "patch_match_stereo"})
+    # RAM-backed filesystem the feature database is built on when memory allows
+    RAM_DATABASE_DIR = Path("/dev/shm")
+    RAM_DATABASE_MIN_AVAILABLE = 4 << 30
+    # Feature databases kept for reuse; least recently used ones go first past this total size
+    FEATURE_CACHE_MAX_BYTES = 10 << 30
+    # Partial copies older than this were left by a failed or killed run
+    FEATURE_CACHE_TMP_MAX_AGE = 60 * 60
+    HASH_CHUNK_SIZE = 1 << 20
+    
     def __init__(self,
                  base_output_dir: str,
                  enable_dense_reconstruction: bool = False,
@@ -93,10 +180,18 @@ class ColmapProcessor:
                  matcher_type: str = "exhaustive",
                  cleanup_temp_files: bool = False,
                  use_gpu: bool = True,
-                 gpu_indices: str = "0",
+                 gpu_indices: Optional[str] = None,
                  enable_dsp_sift: bool = True,
                  enable_guided_matching: bool = True,
-                 enable_geometric_consistency: bool = True):
+                 enable_geometric_consistency: bool = True,
+                 link_inputs: bool = True,
+                 enable_db_cache: bool = True,
+                 vocab_tree_path: Optional[str] = None,
+                 camera_model: Optional[str] = None,
+                 known_focal_length: Optional[float] = None,
+                 max_concurrent_sessions: Optional[int] = None,
+                 export_sparse_ply: bool = True,
+                 ram_database: bool = True):
         """
         Initialize COLMAP processor.
         
@@ -105,13 +200,33 @@ class ColmapProcessor:
             enable_dense_reconstruction: Whether to perform dense reconstruction
             enable_meshing: Whether to generate mesh from dense point cloud
             max_image_size: Maximum image dimension for processing
-            matcher_type: Type of feature matching ("exhaustive" or "sequential")
+            matcher_type: Type of feature matching ("exhaustive", "sequential",
+                "vocab_tree", or "auto" to pick one from the image count)
             cleanup_temp_files: Whether to automatically clean up temporary files
             use_gpu: Whether to use GPU acceleration for SIFT processing
-            gpu_indices: Comma-separated GPU indices (e.g., "0,1,2,3")
+            gpu_indices: Comma-separated GPU indices (e.g., "0,1,2,3"); None uses
+                every GPU reported by nvidia-smi
             enable_dsp_sift: Enable Domain Size Pooling SIFT for better features
             enable_guided_matching: Enable guided matching for improved results
             enable_geometric_consistency: Enable geometric consistency in dense reconstruction
+            link_inputs: Hard-link input images into the workspace instead of copying
+                them when both are on the same filesystem
+            enable_db_cache: Reuse the feature database of an earlier run on
+                identical images and settings instead of re-extracting and matching
+            vocab_tree_path: Vocabulary tree file for vocab_tree matching
+                (e.g. vocab_tree_flickr100K_words32K.bin); None uses
+                DEFAULT_VOCAB_TREE_PATH if that file exists
+            camera_model: COLMAP camera model shared by all images (e.g. "SIMPLE_PINHOLE");
+                None keeps COLMAP's default
+            known_focal_length: Focal length in pixels of the shared camera; when set,
+                intrinsics are fixed instead of refined during bundle adjustment
+            max_concurrent_sessions: Sessions processed at once in async mode; later
+                ones queue (defaults to a quarter of the CPU cores)
+            export_sparse_ply: Convert the sparse model to PLY; when off, the COLMAP
+                model directory itself is published as the "sparse_model_dir" output
+            ram_database: Build the feature database on RAM_DATABASE_DIR and move it
+                into the workspace afterwards, when that directory exists and enough
+                memory is available
         """
         self.base_output_dir = Path(base_output_dir)
         self.base_output_dir.mkdir(exist_ok=True)
@@ -125,16 +240,69 @@ class ColmapProcessor:
         self.enable_dsp_sift = enable_dsp_sift
         self.enable_guided_matching = enable_guided_matching
         self.enable_geometric_consistency = enable_geometric_consistency
+        self.link_inputs = link_inputs
+        self.enable_db_cache = enable_db_cache
+        self.vocab_tree_path = vocab_tree_path
+        self.camera_model = camera_model
+        self.known_focal_length = known_focal_length
+        self.export_sparse_ply = export_sparse_ply
+        self.ram_database = ram_database
         
         # Progress tracking
         self._progress: Dict[str, ColmapProgress] = {}
-        self._processing_threads: Dict[str, threading.Thread] = {}
+        self._progress_views: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+        # Latest throttled update per session: (record it applies to, percent, message)
+        self._pending_progress: Dict[str, Tuple[ColmapProgress, float, str]] = {}
+        self._processing_jobs: Dict[str, Future] = {}
+        # Each COLMAP process expects the whole machine: bound the sessions run
+        # at once, and let one GPU command at a time have the GPUs
+        self._session_pool = ThreadPoolExecutor(
+            max_workers=max_concurrent_sessions or max(1, (os.cpu_count() or 1) // 4),
+            thread_name_prefix="colmap-session")
+        self._gpu_slot = threading.BoundedSemaphore(1)
         self._cancel_flags: Dict[str, threading.Event] = {}
+        self._processes: Dict[str, set] = {}
+        # Side work that overlaps the main pipeline: sparse PLY export, model archives
+        self._background_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="colmap-background")
         
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         
         # Verify COLMAP installation
         self._verify_colmap_installation()
+        
+        if self.use_gpu and not self.gpu_indices:
+            self.gpu_indices = self._detect_gpu_indices()
+        
+        if self.vocab_tree_path is None and self.DEFAULT_VOCAB_TREE_PATH.is_file():
+            self.vocab_tree_path = str(self.DEFAULT_VOCAB_TREE_PATH)
+        elif self.vocab_tree_path and not os.path.isfile(self.vocab_tree_path):
+            self.logger.warning(f"Vocabulary tree {self.vocab_tree_path} not found, vocab_tree matching disabled")
+            self.vocab_tree_path = None
+    
+    def _detect_gpu_indices(self) -> str:
+        """
+        List the NVIDIA GPUs on this machine for COLMAP's gpu_index options.
+        
+        SIFT extraction and matching shard images across every listed GPU.
+        
+        Returns:
+            Comma-separated indices such as "0,1", or "-1" to let COLMAP
+            choose when the GPUs cannot be listed
+        """
+        try:
+            result = subprocess.run(['nvidia-smi', '-L'],
+                                  capture_output=True,
+                                  text=True,
+                                  timeout=10)
+        except (subprocess.TimeoutExpired, OSError):
+            return "-1"
+        
+        gpu_count = sum(1 for line in result.stdout.splitlines() if line.startswith("GPU "))
+        if result.returncode != 0 or gpu_count == 0:
+            return "-1"
+        
+        self.logger.info(f"Detected {gpu_count} GPU(s) for COLMAP")
+        return ",".join(str(i) for i in range(gpu_count))
     
     def _verify_colmap_installation(self):
         """Verify that COLMAP is installed and accessible."""
@@ -145,56 +313,138 @@ class ColmapProcessor:
                                   timeout=10)
             if result.returncode == 0:
                 self.logger.info("COLMAP installation verified")
-                self._check_parameter_support()
+                self._check_parameter_support(result.stdout)
             else:
                 raise ColmapError("COLMAP command failed")
         except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.CalledProcessError) as e:
             raise ColmapError(f"COLMAP not found or not working: {str(e)}")
     
-    def _check_parameter_support(self):
-        """Check which advanced parameters are supported by this COLMAP version."""
-        # Test feature_extractor help to see available parameters
-        try:
-            result = subprocess.run(['colmap', 'feature_extractor', '-h'],
-                                  capture_output=True,
-                                  text=True,
-                                  timeout=10)
-            help_text = result.stdout.lower()
-            
-            # Check for DSP-SIFT support
-            if 'estimate_affine_shape' not in help_text or 'domain_size_pooling' not in help_text:
-                self.enable_dsp_sift = False
-                self.logger.warning("DSP-SIFT parameters not supported, disabling advanced features")
-            
-            # Check for GPU support
-            if 'use_gpu' not in help_text:
-                self.use_gpu = False
-                self.logger.warning("GPU parameters not supported, disabling GPU acceleration")
-                
-        except Exception as e:
-            self.logger.warning(f"Could not check parameter support: {str(e)}, using conservative settings")
+    def _check_parameter_support(self, help_output: str):
+        """
+        Check which advanced parameters are supported by this COLMAP version.
+        
+        Probing runs two more COLMAP commands, so the result is cached on disk
+        per COLMAP binary and reused until the binary changes.
+        
+        Args:
+            help_output: Output of `colmap -h`, which names the COLMAP version
+        """
+        cache_path = self._capability_cache_path(help_output)
+        capabilities = None
+        if cache_path is not None:
+            try:
+                with open(cache_path, 'r') as f:
+                    capabilities = json.load(f)
+            except (OSError, ValueError):
+                pass
+        
+        if capabilities is None:
+            capabilities = self._probe_parameter_support()
+            if capabilities is not None and cache_path is not None:
+                try:
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    temp_path = cache_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+                    with open(temp_path, 'w') as f:
+                        json.dump(capabilities, f)
+                    os.replace(temp_path, cache_path)
+                except OSError as e:
+                    self.logger.debug(f"Could not cache COLMAP capabilities: {str(e)}")
+        
+        if capabilities is None:
             # Disable advanced features as fallback
+            capabilities = {"dsp_sift": False, "gpu": False, "guided_matching": False}
+        
+        if not capabilities.get("dsp_sift"):
+            if self.enable_dsp_sift:
+                self.logger.warning("DSP-SIFT parameters not supported, disabling advanced features")
             self.enable_dsp_sift = False
-            self.enable_guided_matching = False
+        if not capabilities.get("gpu"):
+            if self.use_gpu:
+                self.logger.warning("GPU parameters not supported, disabling GPU acceleration")
             self.use_gpu = False
+        if not capabilities.get("guided_matching"):
+            if self.enable_guided_matching:
+                self.logger.warning("Guided matching not supported, disabling feature")
+            self.enable_guided_matching = False
+    
+    @staticmethod
+    def _capability_cache_path(help_output: str) -> Optional[Path]:
+        """
+        Locate the capability cache file for the COLMAP binary on PATH.
         
-        # Test matcher help for guided matching
+        The key covers the binary's location, size and modification time and
+        the version line of its help output, so upgrades are re-probed.
+        """
+        executable = shutil.which('colmap')
+        if executable is None:
+            return None
         try:
-            result = subprocess.run(['colmap', 'exhaustive_matcher', '-h'],
-                                  capture_output=True,
-                                  text=True,
+            stat_result = os.stat(executable)
+        except OSError:
+            return None
+        
+        version_line = help_output.strip().splitlines()[0] if help_output.strip() else ""
+        key = hashlib.blake2b(digest_size=16)
+        key.update(f"{os.path.realpath(executable)}\0{stat_result.st_size}\0"
+                   f"{stat_result.st_mtime_ns}\0{version_line}".encode())
+        return Path.home() / ".cache" / "colmap_wrapper" / f"caps_{key.hexdigest()}.json"
+    
+    def _probe_parameter_support(self) -> Optional[Dict[str, bool]]:
+        """
+        Ask COLMAP which advanced parameters it accepts.
+        
+        Returns:
+            Dictionary of supported features, or None if COLMAP could not be asked
+        """
+        try:
+            # Test feature_extractor help to see available parameters; the flag
+            # names are fixed-case ASCII, so the raw bytes are searched directly
+            result = subprocess.run(['colmap', 'feature_extractor', '-h'],
+                                  stdout=subprocess.PIPE,
+                                  stderr=subprocess.DEVNULL,
                                   timeout=10)
-            help_text = result.stdout.lower()
+            extractor_help = result.stdout
             
-            if 'guided_matching' not in help_text:
-                self.enable_guided_matching = False
-                self.logger.warning("Guided matching not supported, disabling feature")
-                
+            # Test matcher help for guided matching
+            result = subprocess.run(['colmap', 'exhaustive_matcher', '-h'],
+                                  stdout=subprocess.PIPE,
+                                  stderr=subprocess.DEVNULL,
+                                  timeout=10)
+            matcher_help = result.stdout
         except Exception as e:
-            self.logger.warning(f"Could not check matcher parameters: {str(e)}")
-            self.enable_guided_matching = False
+            self.logger.warning(f"Could not check parameter support: {str(e)}, using conservative settings")
+            return None
+        
+        return {
+            "dsp_sift": b'estimate_affine_shape' in extractor_help and b'domain_size_pooling' in extractor_help,
+            "gpu": b'use_gpu' in extractor_help,
+            "guided_matching": b'guided_matching' in matcher_help
+        }
+    
+    def run_config(self, **overrides) -> ColmapRunConfig:
+        """
+        Build a per-run configuration from this processor's defaults.
+        
+        Args:
+            **overrides: ColmapRunConfig fields to override; None values keep the default
+            
+        Returns:
+            ColmapRunConfig for a single processing run
+        """
+        config = ColmapRunConfig(
+            enable_dense_reconstruction=self.enable_dense_reconstruction,
+            enable_meshing=self.enable_meshing,
+            max_image_size=self.max_image_size,
+            matcher_type=self.matcher_type,
+            camera_model=self.camera_model,
+            known_focal_length=self.known_focal_length
+        )
+        config = replace(config, **{k: v for k, v in overrides.items() if v is not None})
+        config.matcher_type = config.matcher_type.lower()
+        return config
     
-    def process_images(self, session_id: str, image_files: List[str], async_mode: bool = False) -> Dict[str, Any]:
+    def process_images(self, session_id: str, image_files: List[str], async_mode: bool = False,
+                       config: Optional[ColmapRunConfig] = None) -> Dict[str, Any]:
         """
         Start COLMAP processing for a session.
         
@@ -202,12 +452,16 @@ class ColmapProcessor:
             session_id: Unique session identifier
             image_files: List of image file paths
             async_mode: If True, process in background thread; if False, process synchronously
+            config: Settings for this run (defaults to the processor's own settings)
             
         Returns:
             Dictionary with processing information
         """
-        if session_id in self._processing_threads:
-            if self._processing_threads[session_id].is_alive():
+        if config is None:
+            config = self.run_config()
+        
+        if session_id in self._processing_jobs:
+            if not self._processing_jobs[session_id].done():
                 raise ColmapError(f"Processing already in progress for session {session_id}")
         
         # Initialize progress tracking
@@ -217,21 +471,16 @@ class ColmapProcessor:
             status=ProcessingStatus.PENDING,
             progress_percent=0.0,
             message="Initializing COLMAP processing",
-            start_time=datetime.now().isoformat()
+            start_time=_now_iso()
         )
         
         # Create cancel flag
         self._cancel_flags[session_id] = threading.Event()
         
         if async_mode:
-            # Start processing in background thread
-            thread = threading.Thread(
-                target=self._process_session,
-                args=(session_id, image_files),
-                daemon=True
-            )
-            self._processing_threads[session_id] = thread
-            thread.start()
+            # Queue processing on the session pool
+            self._processing_jobs[session_id] = self._session_pool.submit(
+                self._process_session, session_id, image_files, config)
             
             return {
                 "message": "COLMAP processing started",
@@ -242,7 +491,7 @@ class ColmapProcessor:
         else:
             # Process synchronously
             try:
-                self._process_session(session_id, image_files)
+                self._process_session(session_id, image_files, config)
                 
                 # Get final progress status
                 final_progress = self.get_progress(session_id)
@@ -271,11 +520,24 @@ class ColmapProcessor:
                     "error": str(e)
                 }
     
-    def _process_session(self, session_id: str, image_files: List[str]):
+    def _process_session(self, session_id: str, image_files: List[str], config: ColmapRunConfig):
         """Internal method to process a session in background thread."""
         try:
+            cancel_flag = self._cancel_flags[session_id]
             workspace_dir = self.base_output_dir / f"colmap_session_{session_id}"
-            workspace_dir.mkdir(exist_ok=True)
+            images_dir = workspace_dir / "images"
+            database_dir = workspace_dir / "database"
+            sparse_dir = workspace_dir / "sparse"
+            dense_dir = workspace_dir / "dense"
+            mesh_dir = workspace_dir / "mesh"
+            
+            workspace_dirs = [images_dir, database_dir, sparse_dir]
+            if config.enable_dense_reconstruction:
+                workspace_dirs.append(dense_dir)
+                if config.enable_meshing:
+                    workspace_dirs.append(mesh_dir)
+            for directory in workspace_dirs:
+                directory.mkdir(parents=True, exist_ok=True)
             
             # Update progress
             self._update_progress(session_id, ProcessingStage.INITIALIZATION, 
@@ -283,132 +545,96 @@ class ColmapProcessor:
                                 "Setting up workspace and copying images")
             
             # Copy images to workspace
-            images_dir = workspace_dir / "images"
-            images_dir.mkdir(exist_ok=True)
-            
-            copied_images = []
-            for i, image_path in enumerate(image_files):
-                if self._cancel_flags[session_id].is_set():
-                    self._handle_cancellation(session_id)
-                    return
-                
-                # Copy image with sequential naming
-                image_name = f"image_{i+1:04d}.jpg"
-                dest_path = images_dir / image_name
-                shutil.copy2(image_path, dest_path)
-                copied_images.append(str(dest_path))
-                
-                progress = 5.0 + (i / len(image_files)) * 5.0
-                self._update_progress(session_id, ProcessingStage.INITIALIZATION,
-                                    ProcessingStatus.RUNNING, progress,
-                                    f"Copied {i+1}/{len(image_files)} images")
-            
-            # Create database
-            database_dir = workspace_dir / "database"
-            database_dir.mkdir(exist_ok=True)
-            database_path = database_dir / "database.db"
-            
-            self._update_progress(session_id, ProcessingStage.FEATURE_EXTRACTION,
-                                ProcessingStatus.RUNNING, 15.0,
-                                "Extracting features from images")
-            
-            # Feature extraction with performance optimizations
-            feature_cmd = [
-                "colmap", "feature_extractor",
-                "--database_path", str(database_path),
-                "--image_path", str(images_dir),
-                "--ImageReader.single_camera", "1",
-                "--SiftExtraction.max_image_size", str(self.max_image_size)
-            ]
-            
-            # Add DSP-SIFT optimizations for better features (if supported by this COLMAP version)
-            if self.enable_dsp_sift:
-                feature_cmd.extend([
-                    "--SiftExtraction.estimate_affine_shape", "true",
-                    "--SiftExtraction.domain_size_pooling", "true"
-                ])
-            
-            # Add GPU acceleration if enabled and supported
-            if self.use_gpu:
-                feature_cmd.extend([
-                    "--SiftExtraction.use_gpu", "true",
-                    "--SiftExtraction.gpu_index", self.gpu_indices
-                ])
-            
-            self._run_colmap_command(feature_cmd, session_id)
-            
-            if self._cancel_flags[session_id].is_set():
+            images_path = str(images_dir)
+            copied_images = self._stage_images(session_id, image_files, images_dir,
+                                               config.max_image_size)
+            if copied_images is None:
                 self._handle_cancellation(session_id)
                 return
             
-            self._update_progress(session_id, ProcessingStage.FEATURE_MATCHING,
-                                ProcessingStatus.RUNNING, 35.0,
-                                "Matching features between images")
-            
-            # Feature matching with performance optimizations
-            if self.matcher_type == "sequential":
-                match_cmd = [
-                    "colmap", "sequential_matcher",
-                    "--database_path", str(database_path)
-                ]
-            else:
-                match_cmd = [
-                    "colmap", "exhaustive_matcher",
-                    "--database_path", str(database_path)
-                ]
-            
-            # Add guided matching for better results (if supported by this COLMAP version)
-            if self.enable_guided_matching:
-                match_cmd.extend(["--SiftMatching.guided_matching", "true"])
+            database_path = database_dir / "database.db"
             
-            # Add GPU acceleration for matching if enabled and supported
-            if self.use_gpu:
-                match_cmd.extend([
-                    "--SiftMatching.use_gpu", "true",
-                    "--SiftMatching.gpu_index", self.gpu_indices
-                ])
+            config = replace(config, matcher_type=self._resolve_matcher_type(config.matcher_type,
+                                                                              len(copied_images)))
             
-            self._run_colmap_command(match_cmd, session_id, timeout_minutes=10)
+            camera_args, intrinsics_known = self._camera_args(config, image_files[0], copied_images[0])
             
-            if self._cancel_flags[session_id].is_set():
-                self._handle_cancellation(session_id)
-                return
+            cache_path = self._feature_cache_path(image_files, config) if self.enable_db_cache else None
+            if cache_path is not None and cache_path.exists():
+                # Identical images and settings were matched before: reuse that database
+                self._update_progress(session_id, ProcessingStage.FEATURE_MATCHING,
+                                    ProcessingStatus.RUNNING, 50.0,
+                                    "Reusing features and matches from an identical image set")
+                if database_path.exists():
+                    database_path.unlink()
+                copy_file_fast(str(cache_path), str(database_path))
+                # Mark the entry as recently used so eviction keeps it
+                try:
+                    os.utime(cache_path)
+                except OSError:
+                    pass
+            else:
+                # Extraction and matching write the database in many small
+                # transactions; on tmpfs their fsyncs cost nothing
+                ram_dir = self._ram_workspace(session_id)
+                work_database_path = ram_dir / "database.db" if ram_dir else database_path
+                try:
+                    if not self._extract_and_match(session_id, work_database_path, images_dir,
+                                                   config, camera_args):
+                        self._handle_cancellation(session_id)
+                        return
+                    if ram_dir is not None:
+                        shutil.move(str(work_database_path), str(database_path))
+                finally:
+                    if ram_dir is not None:
+                        shutil.rmtree(ram_dir, ignore_errors=True)
+                if cache_path is not None:
+                    self._store_feature_cache(database_path, cache_path)
             
             self._update_progress(session_id, ProcessingStage.SPARSE_RECONSTRUCTION,
                                 ProcessingStatus.RUNNING, 55.0,
                                 "Performing sparse 3D reconstruction")
             
             # Sparse reconstruction
-            sparse_dir = workspace_dir / "sparse"
-            sparse_dir.mkdir(exist_ok=True)
-            
             self._run_colmap_command([
                 "colmap", "mapper",
                 "--database_path", str(database_path),
-                "--image_path", str(images_dir),
+                "--image_path", images_path,
                 "--output_path", str(sparse_dir)
-            ], session_id, timeout_minutes=20)  # Mapper can take time but 20min should be max for 20 images
+            ] + self._mapper_args(len(copied_images), intrinsics_known), session_id, timeout_minutes=20)  # Mapper can take time but 20min should be max for 20 images
             
-            if self._cancel_flags[session_id].is_set():
+            if cancel_flag.is_set():
                 self._handle_cancellation(session_id)
                 return
             
             # Convert sparse model to PLY format
             sparse_ply_path = workspace_dir / "sparse_model.ply"
             model_dir = sparse_dir / "0"
-            if model_dir.exists():
-                self._run_colmap_command([
+            model_path = str(model_dir)
+            convert_task = None
+            if model_dir.exists() and self.export_sparse_ply:
+                convert_cmd = [
                     "colmap", "model_converter",
-                    "--input_path", str(model_dir),
+                    "--input_path", model_path,
                     "--output_path", str(sparse_ply_path),
                     "--output_type", "PLY"
-                ], session_id)
+                ]
+                if config.enable_dense_reconstruction:
+                    # The export only reads the sparse model, so it runs on the CPU
+                    # while the dense steps keep the GPU busy
+                    convert_task = self._background_pool.submit(self._run_colmap_command,
+                                                                convert_cmd, session_id)
+                else:
+                    self._run_colmap_command(convert_cmd, session_id)
             
-            output_files = [{"type": "sparse_model", "path": str(sparse_ply_path)}]
+            if self.export_sparse_ply:
+                output_files = [OutputFile("sparse_model", str(sparse_ply_path))]
+            else:
+                output_files = [OutputFile("sparse_model_dir", model_path)]
             
             # Dense reconstruction (optional)
-            if self.enable_dense_reconstruction:
-                if self._cancel_flags[session_id].is_set():
+            if config.enable_dense_reconstruction:
+                if cancel_flag.is_set():
                     self._handle_cancellation(session_id)
                     return
                 
@@ -416,23 +642,22 @@ class ColmapProcessor:
                                     ProcessingStatus.RUNNING, 75.0,
                                     "Performing dense reconstruction")
                 
-                dense_dir = workspace_dir / "dense"
-                dense_dir.mkdir(exist_ok=True)
+                dense_path = str(dense_dir)
                 
                 # Image undistortion
                 self._run_colmap_command([
                     "colmap", "image_undistorter",
-                    "--image_path", str(images_dir),
-                    "--input_path", str(model_dir),
-                    "--output_path", str(dense_dir),
+                    "--image_path", images_path,
+                    "--input_path", model_path,
+                    "--output_path", dense_path,
                     "--output_type", "COLMAP"
                 ], session_id)
                 
                 # Patch match stereo with optimizations
                 stereo_cmd = [
                     "colmap", "patch_match_stereo",
-                    "--workspace_path", str(dense_dir),
-                    "--PatchMatchStereo.max_image_size", str(self.max_image_size)
+                    "--workspace_path", dense_path,
+                    "--PatchMatchStereo.max_image_size", str(config.max_image_size)
                 ]
                 
                 # Add geometric consistency if enabled
@@ -451,19 +676,22 @@ class ColmapProcessor:
                 self._run_colmap_command(stereo_cmd, session_id)
                 
                 # Stereo fusion
+                dense_ply_path = dense_dir / "fused.ply"
                 self._run_colmap_command([
                     "colmap", "stereo_fusion",
-                    "--workspace_path", str(dense_dir),
-                    "--output_path", str(dense_dir / "fused.ply")
+                    "--workspace_path", dense_path,
+                    "--output_path", str(dense_ply_path)
                 ], session_id)
                 
-                dense_ply_path = dense_dir / "fused.ply"
                 if dense_ply_path.exists():
-                    output_files.append({"type": "dense_pointcloud", "path": str(dense_ply_path)})
+                    output_files.append(OutputFile("dense_pointcloud", str(dense_ply_path)))
+            
+            if convert_task is not None:
+                convert_task.result()
             
             # Mesh generation (optional)
-            if self.enable_meshing and self.enable_dense_reconstruction:
-                if self._cancel_flags[session_id].is_set():
+            if config.enable_meshing and config.enable_dense_reconstruction:
+                if cancel_flag.is_set():
                     self._handle_cancellation(session_id)
                     return
                 
@@ -471,27 +699,16 @@ class ColmapProcessor:
                                     ProcessingStatus.RUNNING, 90.0,
                                     "Generating mesh from dense point cloud")
                 
-                mesh_dir = workspace_dir / "mesh"
-                mesh_dir.mkdir(exist_ok=True)
-                
                 # Poisson meshing
+                mesh_ply_path = mesh_dir / "mesh.ply"
                 self._run_colmap_command([
                     "colmap", "poisson_mesher",
-                    "--input_path", str(dense_dir / "fused.ply"),
-                    "--output_path", str(mesh_dir / "mesh.ply")
+                    "--input_path", str(dense_ply_path),
+                    "--output_path", str(mesh_ply_path)
                 ], session_id)
                 
-                mesh_ply_path = mesh_dir / "mesh.ply"
                 if mesh_ply_path.exists():
-                    output_files.append({"type": "mesh", "path": str(mesh_ply_path)})
-            
-            # Create compressed archive (optional, don't fail if this doesn't work)
-            try:
-                self._create_model_archive(session_id, workspace_dir, output_files)
-                self.logger.info(f"Successfully created model archive for session {session_id}")
-            except Exception as archive_error:
-                self.logger.warning(f"Failed to create model archive for session {session_id}: {str(archive_error)}")
-                # Continue processing - archive creation is not critical
+                    output_files.append(OutputFile("mesh", str(mesh_ply_path)))
             
             # Update final progress
             self._update_progress(session_id, ProcessingStage.COMPLETED,
@@ -499,6 +716,13 @@ class ColmapProcessor:
                                 "COLMAP processing completed successfully",
                                 output_files=output_files)
             
+            # Compressing large dense clouds takes a while; the models are usable
+            # without the archive, so it is added to output_files once ready
+            archive_task = self._background_pool.submit(self._create_model_archive, session_id,
+                                                     workspace_dir, output_files, config)
+            archive_task.add_done_callback(
+                lambda task: self._publish_archive(session_id, output_files, task))
+            
             return  # Important: Return here to avoid hitting the exception handler
             
         except Exception as e:
@@ -514,29 +738,376 @@ class ColmapProcessor:
                                 f"Processing failed: {error_message}",
                                 error_message=error_message)
     
-    def _run_colmap_command(self, command: List[str], session_id: str, timeout_minutes: int = 30):
-        """Run a COLMAP command with error handling, cancellation support, and timeout."""
+    def _extract_and_match(self, session_id: str, database_path: Path, images_dir: Path,
+                           config: ColmapRunConfig, camera_args: List[str]) -> bool:
+        """
+        Run feature extraction and matching into the session database.
+        
+        Args:
+            session_id: Session being processed
+            database_path: COLMAP database to fill
+            images_dir: Workspace images directory
+            config: Settings for this run
+            camera_args: ImageReader options describing the shared camera
+            
+        Returns:
+            False if processing was cancelled, True otherwise
+        """
+        cancel_flag = self._cancel_flags[session_id]
+        self._update_progress(session_id, ProcessingStage.FEATURE_EXTRACTION,
+                            ProcessingStatus.RUNNING, 15.0,
+                            "Extracting features from images")
+        
+        # Feature extraction with performance optimizations
+        feature_cmd = [
+            "colmap", "feature_extractor",
+            "--database_path", str(database_path),
+            "--image_path", str(images_dir),
+            "--ImageReader.single_camera", "1",
+            "--SiftExtraction.max_image_size", str(config.max_image_size)
+        ] + camera_args
+        
+        # Add DSP-SIFT optimizations for better features (if supported by this COLMAP version)
+        if self.enable_dsp_sift:
+            feature_cmd.extend([
+                "--SiftExtraction.estimate_affine_shape", "true",
+                "--SiftExtraction.domain_size_pooling", "true"
+            ])
+        
+        # Add GPU acceleration if enabled and supported
+        if self.use_gpu:
+            feature_cmd.extend([
+                "--SiftExtraction.use_gpu", "true",
+                "--SiftExtraction.gpu_index", self.gpu_indices
+            ])
+        
+        self._run_colmap_command(feature_cmd, session_id, progress_band=(15.0, 35.0))
+        
+        if cancel_flag.is_set():
+            return False
+        
+        self._update_progress(session_id, ProcessingStage.FEATURE_MATCHING,
+                            ProcessingStatus.RUNNING, 35.0,
+                            "Matching features between images")
+        
+        # Feature matching with performance optimizations
+        if config.matcher_type == "sequential":
+            match_cmd = [
+                "colmap", "sequential_matcher",
+                "--database_path", str(database_path)
+            ]
+        elif config.matcher_type == "vocab_tree":
+            # Only matches each image against its most similar images: O(N*k) pairs instead of O(N^2)
+            match_cmd = [
+                "colmap", "vocab_tree_matcher",
+                "--database_path", str(database_path),
+                "--VocabTreeMatching.vocab_tree_path", self.vocab_tree_path,
+                "--VocabTreeMatching.num_images", "100"
+            ]
+        else:
+            match_cmd = [
+                "colmap", "exhaustive_matcher",
+                "--database_path", str(database_path)
+            ]
+        
+        # Add guided matching for better results (if supported by this COLMAP version)
+        if self.enable_guided_matching:
+            match_cmd.extend(["--SiftMatching.guided_matching", "true"])
+        
+        # Add GPU acceleration for matching if enabled and supported
+        if self.use_gpu:
+            match_cmd.extend([
+                "--SiftMatching.use_gpu", "true",
+                "--SiftMatching.gpu_index", self.gpu_indices
+            ])
+        
+        self._run_colmap_command(match_cmd, session_id, timeout_minutes=10, progress_band=(35.0, 55.0))
+        
+        return not cancel_flag.is_set()
+    
+    def _ram_workspace(self, session_id: str) -> Optional[Path]:
+        """
+        Create a RAM-backed scratch directory for a session's feature database.
+        
+        Args:
+            session_id: Session being processed
+            
+        Returns:
+            The directory, or None if the database should be built in the workspace
+        """
+        if not self.ram_database or not self.RAM_DATABASE_DIR.is_dir():
+            return None
+        # tmpfs mounts can be far smaller than memory (64 MB by default in Docker)
+        available = min(_available_memory(), shutil.disk_usage(self.RAM_DATABASE_DIR).free)
+        if available < self.RAM_DATABASE_MIN_AVAILABLE:
+            return None
+        
+        ram_dir = self.RAM_DATABASE_DIR / f"colmap_{session_id}"
+        try:
+            ram_dir.mkdir(exist_ok=True)
+        except OSError as e:
+            self.logger.warning(f"Could not use {ram_dir} for the feature database: {str(e)}")
+            return None
+        return ram_dir
+    
+    def _resolve_matcher_type(self, matcher_type: str, n_images: int) -> str:
+        """
+        Turn the requested matcher type into one COLMAP can run.
+        
+        "auto" uses the vocabulary tree matcher for large image sets and
+        exhaustive matching otherwise. Vocab tree matching needs a vocabulary
+        tree file and falls back to exhaustive matching without one.
+        """
+        if matcher_type == "auto":
+            if n_images > self.VOCAB_TREE_MIN_IMAGES and self.vocab_tree_path:
+                return "vocab_tree"
+            return "exhaustive"
+        
+        if matcher_type == "vocab_tree" and not self.vocab_tree_path:
+            self.logger.warning("vocab_tree matching requested without a vocabulary tree, using exhaustive matching")
+            return "exhaustive"
+        
+        return matcher_type
+    
+    def _camera_args(self, config: ColmapRunConfig, source_image: str,
+                     staged_image: str) -> Tuple[List[str], bool]:
+        """
+        ImageReader options for the camera shared by all images of a run.
+        
+        A known focal length fixes the intrinsics of a pinhole model, with the
+        principal point at the image centre, so bundle adjustment no longer
+        has to estimate them.
+        
+        Args:
+            config: Settings for this run
+            source_image: An input image, whose resolution the focal length refers to
+            staged_image: The same image as staged, possibly downscaled
+            
+        Returns:
+            Tuple of (feature_extractor options, whether the intrinsics are known)
+        """
+        camera_model = config.camera_model
+        if not config.known_focal_length:
+            return (["--ImageReader.camera_model", camera_model] if camera_model else []), False
+        
+        camera_model = camera_model or "SIMPLE_PINHOLE"
+        if camera_model not in ("SIMPLE_PINHOLE", "PINHOLE"):
+            self.logger.warning(f"known_focal_length needs a pinhole camera model, not {camera_model}; estimating intrinsics")
+            return ["--ImageReader.camera_model", camera_model], False
+        
+        try:
+            if Image is None:
+                raise OSError("Pillow is not installed")
+            with Image.open(source_image) as image:
+                source_width = image.size[0]
+            with Image.open(staged_image) as image:
+                width, height = image.size
+        except OSError as e:
+            self.logger.warning(f"Could not read image size from {staged_image}: {str(e)}; estimating intrinsics")
+            return ["--ImageReader.camera_model", camera_model], False
+        
+        # The focal length is in pixels of the input images; staging may have downscaled them
+        focal = float(config.known_focal_length) * width / source_width
+        focal_params = [focal] if camera_model == "SIMPLE_PINHOLE" else [focal, focal]
+        camera_params = ",".join(f"{value:g}" for value in focal_params + [width / 2, height / 2])
+        return ["--ImageReader.camera_model", camera_model,
+                "--ImageReader.camera_params", camera_params], True
+    
+    def _mapper_args(self, n_images: int, intrinsics_known: bool = False) -> List[str]:
+        """
+        Extra mapper options for an image set.
+        
+        Large collections run global bundle adjustment less often and with
+        fewer iterations, which keeps the mapper from stalling past a few
+        hundred images without a noticeable loss in accuracy. Known
+        intrinsics are kept fixed, leaving fewer parameters to optimise.
+        
+        Args:
+            n_images: Number of images in the set
+            intrinsics_known: Whether the camera intrinsics were given up front
+        """
+        args = []
+        if intrinsics_known:
+            args.extend([
+                "--Mapper.ba_refine_focal_length", "0",
+                "--Mapper.ba_refine_principal_point", "0",
+                "--Mapper.ba_refine_extra_params", "0"
+            ])
+        
+        if n_images > self.FAST_MAPPER_MIN_IMAGES:
+            args.extend([
+                "--Mapper.ba_global_images_ratio", "1.2",
+                "--Mapper.ba_global_points_ratio", "1.2",
+                "--Mapper.ba_global_points_freq", "200000",
+                "--Mapper.ba_global_max_num_iterations", "20",
+                "--Mapper.ba_global_max_refinements", "3"
+            ])
+        return args
+    
+    def _feature_cache_path(self, image_files: List[str], config: ColmapRunConfig) -> Path:
+        """
+        Locate the cached feature database for an image set.
+        
+        The key covers the content and order of the images (the database
+        records them under their sequential workspace names) and every setting
+        that changes extracted features or matches.
+        """
+        key = hashlib.blake2b(digest_size=20)
+        key.update(json.dumps({
+            "max_image_size": config.max_image_size,
+            "matcher_type": config.matcher_type,
+            "camera_model": config.camera_model,
+            "known_focal_length": config.known_focal_length,
+            "vocab_tree_path": self.vocab_tree_path if config.matcher_type == "vocab_tree" else None,
+            "enable_dsp_sift": self.enable_dsp_sift,
+            "enable_guided_matching": self.enable_guided_matching
+        }, sort_keys=True).encode())
+        # hashlib releases the GIL while digesting, so images hash in parallel
+        max_workers = min(len(image_files), 8, os.cpu_count() or 1) or 1
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="colmap-hash") as executor:
+            for digest in executor.map(self._file_digest, image_files):
+                key.update(digest)
+        return self.base_output_dir / "feature_cache" / f"{key.hexdigest()}.db"
+    
+    @classmethod
+    def _file_digest(cls, path: str) -> bytes:
+        """BLAKE2b digest of a file's contents."""
+        digest = hashlib.blake2b()
+        with open(path, 'rb') as f:
+            while chunk := f.read(cls.HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.digest()
+    
+    def _store_feature_cache(self, database_path: Path, cache_path: Path):
+        """Save a matched feature database for reuse; failures only cost the cache entry."""
+        temp_path = cache_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            cache_path.parent.mkdir(exist_ok=True)
+            copy_file_fast(str(database_path), str(temp_path))
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            self.logger.warning(f"Could not cache feature database {database_path}: {str(e)}")
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
+            return
+        self._evict_feature_cache(cache_path.parent)
+    
+    def _evict_feature_cache(self, cache_dir: Path):
+        """
+        Delete the least recently used cached databases until the cache fits
+        FEATURE_CACHE_MAX_BYTES, and partial copies older than FEATURE_CACHE_TMP_MAX_AGE.
+        """
+        entries = []
+        stale_before = time.time() - self.FEATURE_CACHE_TMP_MAX_AGE
+        try:
+            with os.scandir(cache_dir) as it:
+                for entry in it:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                    if entry.name.endswith(".db"):
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+                    elif entry.name.endswith(".tmp") and st.st_mtime < stale_before:
+                        try:
+                            os.unlink(entry.path)
+                            self.logger.info(f"Removed stale partial feature database {entry.path}")
+                        except OSError as e:
+                            self.logger.warning(f"Could not remove {entry.path}: {str(e)}")
+        except OSError as e:
+            self.logger.warning(f"Could not scan feature cache {cache_dir}: {str(e)}")
+            return
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.FEATURE_CACHE_MAX_BYTES:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+                self.logger.info(f"Evicted cached feature database {path}")
+            except OSError as e:
+                self.logger.warning(f"Could not evict cached feature database {path}: {str(e)}")
+    
+    def _run_colmap_command(self, command: List[str], session_id: str, timeout_minutes: int = 30,
+                            progress_band: Optional[Tuple[float, float]] = None):
+        """
+        Run a COLMAP command, waiting for the GPU first if the command uses it.
+        
+        Time spent waiting for another session's GPU command does not count
+        towards the timeout. See _execute_colmap_command for the arguments.
+        """
+        gpu_slot = self._gpu_slot if self.use_gpu and command[1] in self.GPU_COMMANDS else None
+        if gpu_slot is not None:
+            cancel_flag = self._cancel_flags[session_id]
+            while not gpu_slot.acquire(timeout=1.0):
+                if cancel_flag.is_set():
+                    raise ColmapError("Processing cancelled by user")
+        try:
+            self._execute_colmap_command(command, session_id, timeout_minutes, progress_band)
+        finally:
+            if gpu_slot is not None:
+                gpu_slot.release()
+    
+    def _execute_colmap_command(self, command: List[str], session_id: str, timeout_minutes: int = 30,
+                                progress_band: Optional[Tuple[float, float]] = None):
+        """
+        Run a COLMAP command with error handling, cancellation support, and timeout.
+        
+        The command's output goes straight to logs/<command>.log in the session
+        workspace instead of through pipes, so the parent never has to buffer
+        or drain it; failures quote the end of that file.
+        
+        Args:
+            command: COLMAP command line
+            session_id: Session the command belongs to
+            timeout_minutes: Time after which the command is terminated
+            progress_band: Progress percentages (start, end) to interpolate between
+                from the [i/n] counters in the command's output
+        """
         try:
             self.logger.info(f"Running COLMAP command: {' '.join(command)}")
             start_time = time.time()
             
-            process = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
+            log_dir = self.base_output_dir / f"colmap_session_{session_id}" / "logs"
+            log_dir.mkdir(parents=True, exist_ok=True)
+            log_path = log_dir / f"{command[1]}.log"
+            with open(log_path, 'wb') as log_file:
+                process = subprocess.Popen(
+                    command,
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT
+                )
             
-            # Monitor for cancellation and timeout
-            while process.poll() is None:
-                if self._cancel_flags[session_id].is_set():
+            # cancel_processing() terminates the registered process, so waiting
+            # below wakes up on exit, cancellation or timeout without polling
+            cancel_flag = self._cancel_flags[session_id]
+            self._processes.setdefault(session_id, set()).add(process)
+            try:
+                if cancel_flag.is_set():
                     process.terminate()
-                    process.wait(timeout=5)
-                    raise ColmapError("Processing cancelled by user")
                 
-                # Check for timeout
-                elapsed_time = time.time() - start_time
-                if elapsed_time > (timeout_minutes * 60):
+                deadline = start_time + timeout_minutes * 60
+                next_report = start_time + 300.0
+                wait_interval = 1.0 if progress_band else 300.0
+                log_offset = 0
+                while True:
+                    try:
+                        process.wait(timeout=max(0.0, min(wait_interval, deadline - time.time())))
+                        break
+                    except subprocess.TimeoutExpired:
+                        now = time.time()
+                        if now < deadline:
+                            if progress_band:
+                                log_offset = self._report_command_progress(session_id, log_path,
+                                                                           log_offset, progress_band)
+                            if now >= next_report:
+                                # Log progress every 5 minutes for long-running commands
+                                self.logger.info(f"COLMAP command still running after {int((now - start_time)/60)} minutes: {command[1]}")
+                                next_report += 300.0
+                            continue
+                    
                     self.logger.warning(f"COLMAP command timeout after {timeout_minutes} minutes: {' '.join(command)}")
                     process.terminate()
                     try:
@@ -546,41 +1117,33 @@ class ColmapProcessor:
                         process.wait()
                     
                     # Get partial output for debugging
-                    stdout_output, stderr_output = process.communicate()
                     error_msg = f"COLMAP command timed out after {timeout_minutes} minutes"
-                    if stderr_output:
-                        error_msg += f"\nPartial STDERR: {stderr_output.strip()[-1000:]}"  # Last 1000 chars
-                    if stdout_output:
-                        error_msg += f"\nPartial STDOUT: {stdout_output.strip()[-1000:]}"  # Last 1000 chars
+                    output_tail = self._log_tail(log_path)
+                    if output_tail:
+                        error_msg += f"\nPartial output ({log_path}): {output_tail}"
                     error_msg += f"\nCommand: {' '.join(command)}"
                     error_msg += f"\nThis may indicate challenging images with insufficient overlap or too many features."
                     
                     raise ColmapError(error_msg)
-                
-                # Log progress every 5 minutes for long-running commands
-                if elapsed_time > 0 and int(elapsed_time) % 300 == 0:  # Every 5 minutes
-                    self.logger.info(f"COLMAP command still running after {int(elapsed_time/60)} minutes: {command[1]}")
-                
-                time.sleep(0.1)
+            finally:
+                self._processes.get(session_id, set()).discard(process)
+            
+            if cancel_flag.is_set():
+                raise ColmapError("Processing cancelled by user")
             
-            # Get output
-            stdout_output, stderr_output = process.communicate()
             elapsed_time = time.time() - start_time
             
             if process.returncode != 0:
                 error_msg = f"COLMAP command failed with return code {process.returncode} after {elapsed_time:.1f}s"
-                if stderr_output:
-                    error_msg += f"\nSTDERR: {stderr_output.strip()}"
-                if stdout_output:
-                    error_msg += f"\nSTDOUT: {stdout_output.strip()}"
+                output_tail = self._log_tail(log_path)
+                if output_tail:
+                    error_msg += f"\nOutput ({log_path}): {output_tail}"
                 error_msg += f"\nCommand: {' '.join(command)}"
                 
                 self.logger.error(error_msg)
                 raise ColmapError(error_msg)
             else:
                 self.logger.info(f"COLMAP command completed successfully in {elapsed_time:.1f}s: {command[1]}")
-                if stdout_output and len(stdout_output.strip()) > 0:
-                    self.logger.debug(f"STDOUT: {stdout_output.strip()}")
                 
         except subprocess.TimeoutExpired:
             process.kill()
@@ -592,47 +1155,102 @@ class ColmapProcessor:
             self.logger.error(error_msg)
             raise ColmapError(error_msg)
     
-    def _create_model_archive(self, session_id: str, workspace_dir: Path, output_files: List[Dict]):
-        """Create a compressed archive of the generated models."""
+    def _report_command_progress(self, session_id: str, log_path: Path, log_offset: int,
+                                 progress_band: Tuple[float, float]) -> int:
+        """
+        Move the session's progress within a stage from the command's latest output.
+        
+        Args:
+            session_id: Session the command belongs to
+            log_path: Command log file
+            log_offset: Bytes of the log already scanned
+            progress_band: Progress percentages (start, end) of the stage
+            
+        Returns:
+            New log offset to pass on the next call
+        """
+        try:
+            with open(log_path, 'rb') as f:
+                f.seek(log_offset)
+                output = f.read()
+        except OSError:
+            return log_offset
+        
+        # Stop at the last complete line so a counter is never read half-written
+        end = output.rfind(b'\n') + 1
+        last = None
+        for last in COLMAP_PROGRESS_PATTERN.finditer(output, 0, end):
+            pass
+        current = self._progress.get(session_id)
+        if last is not None and current is not None:
+            done, total, block_done, block_total = (int(group or 1) for group in last.groups())
+            if last.group(3) is None:
+                fraction = done / total if total else 0.0
+            else:
+                # Block [i/n, j/m]: row i of n, column j of m
+                fraction = ((done - 1) * block_total + block_done) / (total * block_total or 1)
+            start, stop = progress_band
+            self._update_progress(session_id, current.stage, current.status,
+                                  start + min(fraction, 1.0) * (stop - start), current.message)
+        return log_offset + end
+    
+    @staticmethod
+    def _log_tail(log_path: Path, max_bytes: int = 4096) -> str:
+        """Return the last max_bytes of a command log, or an empty string if it cannot be read."""
+        try:
+            with open(log_path, 'rb') as f:
+                f.seek(max(0, os.fstat(f.fileno()).st_size - max_bytes))
+                return f.read().decode('utf-8', errors='replace').strip()
+        except OSError:
+            return ""
+    
+    def _create_model_archive(self, session_id: str, workspace_dir: Path, output_files: List[OutputFile],
+                              config: ColmapRunConfig) -> Optional[Path]:
+        """Create a compressed archive of the generated models, returning its path."""
         try:
             archive_path = workspace_dir / f"model_{session_id}.zip"
             
             # Ensure we have files to archive
             if not output_files:
                 self.logger.warning(f"No output files to archive for session {session_id}")
-                return
+                return None
             
-            with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            # Level 1 keeps most of DEFLATE's ratio on text models at several times the speed
+            with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
                 # Add model files
                 files_added = 0
                 for file_info in output_files:
                     try:
-                        file_path = Path(file_info['path'])
-                        if file_path.exists() and file_path.is_file():
-                            arcname = f"{file_info['type']}/{file_path.name}"
-                            zipf.write(file_path, arcname)
+                        file_path = Path(file_info.path)
+                        if file_path.is_file():
+                            arcname = f"{file_info.type}/{file_path.name}"
+                            zipf.write(file_path, arcname, compress_type=self._archive_compression(file_path))
                             files_added += 1
                             self.logger.debug(f"Added {file_path} to archive as {arcname}")
+                        elif file_path.is_dir():
+                            # A COLMAP model directory (cameras, images, points3D)
+                            for member in sorted(file_path.iterdir()):
+                                if member.is_file():
+                                    zipf.write(member, f"{file_info.type}/{member.name}",
+                                               compress_type=self._archive_compression(member))
+                                    files_added += 1
                         else:
                             self.logger.warning(f"Output file not found or not a file: {file_path}")
                     except Exception as e:
-                        self.logger.warning(f"Failed to add file {file_info.get('path', 'unknown')} to archive: {str(e)}")
+                        self.logger.warning(f"Failed to add file {file_info.path} to archive: {str(e)}")
                 
                 if files_added == 0:
                     self.logger.warning(f"No files were successfully added to archive for session {session_id}")
-                    return
+                    return None
                 
                 # Add metadata
                 try:
                     metadata = {
                         "session_id": session_id,
-                        "created_at": datetime.now().isoformat(),
-                        "output_files": output_files,
+                        "created_at": _now_iso(),
+                        "output_files": [file_info._asdict() for file_info in output_files],
                         "processing_parameters": {
-                            "enable_dense_reconstruction": self.enable_dense_reconstruction,
-                            "enable_meshing": self.enable_meshing,
-                            "max_image_size": self.max_image_size,
-                            "matcher_type": self.matcher_type,
+                            **asdict(config),
                             "use_gpu": self.use_gpu,
                             "gpu_indices": self.gpu_indices,
                             "enable_dsp_sift": self.enable_dsp_sift,
@@ -641,43 +1259,175 @@ class ColmapProcessor:
                         }
                     }
                     
-                    metadata_path = workspace_dir / "model_metadata.json"
-                    with open(metadata_path, 'w') as f:
-                        json.dump(metadata, f, indent=2)
-                    zipf.write(metadata_path, "metadata.json")
+                    if orjson is not None:
+                        metadata_json = orjson.dumps(metadata, option=orjson.OPT_INDENT_2)
+                    else:
+                        metadata_json = json.dumps(metadata, indent=2)
+                    zipf.writestr("metadata.json", metadata_json)
                     self.logger.debug(f"Added metadata to archive for session {session_id}")
                     
-                    # Clean up temporary metadata file
-                    try:
-                        metadata_path.unlink()
-                    except Exception:
-                        pass  # Ignore cleanup errors
-                        
                 except Exception as e:
                     self.logger.warning(f"Failed to add metadata to archive for session {session_id}: {str(e)}")
                 
             self.logger.info(f"Successfully created archive {archive_path} with {files_added} files")
+            return archive_path
             
         except Exception as e:
             self.logger.error(f"Failed to create model archive for session {session_id}: {str(e)}")
             raise  # Re-raise to be caught by the calling code
     
+    def _publish_archive(self, session_id: str, output_files: List[OutputFile], archive_task):
+        """Add a finished model archive to the output files of the run that produced it."""
+        try:
+            archive_path = archive_task.result()
+        except Exception as e:
+            # Archive creation is not critical; the individual models are still available
+            self.logger.warning(f"Failed to create model archive for session {session_id}: {str(e)}")
+            return
+        if archive_path is None:
+            return
+        
+        # Skip if the session was cleaned up or re-run while the archive was being written
+        current = self._progress.get(session_id)
+        if current is None or current.output_files is not output_files:
+            return
+        self._progress[session_id] = replace(
+            current, output_files=output_files + [OutputFile("archive", str(archive_path))])
+    
+    @staticmethod
+    def _archive_compression(file_path: Path) -> int:
+        """
+        Pick the ZIP compression for a model file.
+        
+        Binary PLY vertex data barely shrinks under DEFLATE and images or
+        archives are compressed already, so those are stored as-is; text
+        formats (ASCII PLY, COLMAP .txt models) are deflated.
+        """
+        suffix = file_path.suffix.lower()
+        if suffix in ('.jpg', '.jpeg', '.png', '.zip', '.gz', '.glb'):
+            return zipfile.ZIP_STORED
+        if suffix == '.ply':
+            with open(file_path, 'rb') as f:
+                header = f.read(64)
+            if b'format binary' in header:
+                return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+    
+    def _stage_images(self, session_id: str, image_files: List[str], images_dir: Path,
+                      max_image_size: Optional[int] = None) -> Optional[List[str]]:
+        """
+        Link or copy the input images into the workspace with sequential names.
+        
+        Images larger than max_image_size are written downscaled instead, so
+        feature extraction and dense stereo decode the small version rather
+        than resizing the full-resolution JPEG again at every stage.
+        
+        Copies are independent and I/O bound, so they run on a thread pool.
+        Progress is published about once per percent of the batch rather than
+        once per image, so large sessions do not flood the progress record.
+        
+        Args:
+            session_id: Session being processed
+            image_files: Source image paths
+            images_dir: Workspace images directory
+            max_image_size: Largest width or height to stage; None stages images as-is
+            
+        Returns:
+            Workspace image paths in input order, or None if processing was cancelled
+        """
+        total = len(image_files)
+        report_every = max(1, total // 100)
+        cancel_flag = self._cancel_flags[session_id]
+        copied_images = [str(images_dir / f"image_{i+1:04d}.jpg") for i in range(total)]
+        
+        def copy_image(index: int) -> bool:
+            if cancel_flag.is_set():
+                return False
+            src, dst = image_files[index], copied_images[index]
+            # Never write through a previous run's file: it may be a hard link to the upload
+            try:
+                os.unlink(dst)
+            except FileNotFoundError:
+                pass
+            if max_image_size and Image is not None:
+                try:
+                    if downscale_image(src, dst, max_image_size):
+                        return True
+                except OSError as e:
+                    self.logger.warning(f"Could not downscale {src}, staging it unchanged: {str(e)}")
+            if self.link_inputs:
+                try:
+                    # COLMAP only reads the images, so sharing the inode is safe
+                    os.link(src, dst)
+                    return True
+                except OSError:
+                    pass  # Different filesystem or links unsupported; copy instead
+            copy_file_fast(src, dst)
+            return True
+        
+        max_workers = min(total, 32, (os.cpu_count() or 1) * 4) or 1
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="colmap-ingest") as executor:
+            futures = [executor.submit(copy_image, i) for i in range(total)]
+            try:
+                for done, future in enumerate(as_completed(futures), start=1):
+                    if not future.result():
+                        return None
+                    if done % report_every == 0 or done == total:
+                        self._update_progress(session_id, ProcessingStage.INITIALIZATION,
+                                            ProcessingStatus.RUNNING, 5.0 + (done / total) * 5.0,
+                                            f"Copied {done}/{total} images")
+            finally:
+                # Drop queued copies after a cancel or failure; running ones finish on exit
+                for future in futures:
+                    future.cancel()
+        
+        return copied_images
+    
     def _update_progress(self, session_id: str, stage: ProcessingStage, 
                         status: ProcessingStatus, progress_percent: float, 
                         message: str, error_message: str = None, 
-                        output_files: List[Dict] = None):
-        """Update progress for a session."""
-        if session_id in self._progress:
-            self._progress[session_id].stage = stage
-            self._progress[session_id].status = status
-            self._progress[session_id].progress_percent = progress_percent
-            self._progress[session_id].message = message
-            if error_message:
-                self._progress[session_id].error_message = error_message
-            if output_files:
-                self._progress[session_id].output_files = output_files
-            if status in [ProcessingStatus.COMPLETED, ProcessingStatus.ERROR, ProcessingStatus.CANCELLED]:
-                self._progress[session_id].end_time = datetime.now().isoformat()
+                        output_files: List[OutputFile] = None):
+        """
+        Update progress for a session.
+        
+        The session's ColmapProgress is never modified in place: a new record is
+        built and published with one dict assignment, so get_progress() always
+        sees a consistent stage/status/percentage without taking a lock.
+        
+        Updates within a stage are coalesced to one per PROGRESS_THROTTLE_NS
+        unless the percentage moves by 5 or more; stage and status changes,
+        errors and output files are always published. A held-back update is
+        kept as pending and shown by get_progress(), so the last value before
+        a stall or a stage change is never lost.
+        """
+        current = self._progress.get(session_id)
+        if current is None:
+            return
+        
+        now_ns = time.monotonic_ns()
+        if (stage == current.stage and status == current.status
+                and not error_message and not output_files
+                and now_ns - current.last_emit_ns < self.PROGRESS_THROTTLE_NS
+                and abs(progress_percent - current.progress_percent) < 5.0):
+            self._pending_progress[session_id] = (current, progress_percent, message)
+            return
+        
+        changes = {
+            "stage": stage,
+            "status": status,
+            "progress_percent": progress_percent,
+            "message": message,
+            "last_emit_ns": now_ns
+        }
+        if error_message:
+            changes["error_message"] = error_message
+        if output_files:
+            changes["output_files"] = output_files
+        if status in [ProcessingStatus.COMPLETED, ProcessingStatus.ERROR, ProcessingStatus.CANCELLED]:
+            changes["end_time"] = _now_iso()
+        
+        self._pending_progress.pop(session_id, None)
+        self._progress[session_id] = replace(current, **changes)
     
     def _handle_cancellation(self, session_id: str):
         """Handle processing cancellation."""
@@ -686,12 +1436,30 @@ class ColmapProcessor:
                             "Processing cancelled by user")
     
     def get_progress(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Get progress information for a session."""
-        if session_id not in self._progress:
+        """
+        Get progress information for a session.
+        
+        Published progress records never change, so the dict built for a
+        record is reused by every poll until the next update replaces it.
+        Callers must treat the returned dict as read-only.
+        """
+        progress = self._progress.get(session_id)
+        if progress is None:
             return None
         
-        progress = self._progress[session_id]
-        return {
+        # A throttled update newer than the published record is shown as well;
+        # one for an older record was superseded and is ignored
+        view_key = progress
+        pending = self._pending_progress.get(session_id)
+        if pending is not None and pending[0] is progress:
+            view_key = pending
+            progress = replace(progress, progress_percent=pending[1], message=pending[2])
+        
+        cached = self._progress_views.get(session_id)
+        if cached is not None and cached[0] is view_key:
+            return cached[1]
+        
+        view = {
             "session_id": progress.session_id,
             "stage": progress.stage.value if hasattr(progress.stage, 'value') else str(progress.stage),
             "status": progress.status.value if hasattr(progress.status, 'value') else str(progress.status),
@@ -700,13 +1468,21 @@ class ColmapProcessor:
             "start_time": progress.start_time,
             "end_time": progress.end_time,
             "error_message": progress.error_message,
-            "output_files": progress.output_files or []
+            "output_files": [file_info._asdict() for file_info in progress.output_files]
         }
+        self._progress_views[session_id] = (view_key, view)
+        return view
     
     def cancel_processing(self, session_id: str) -> bool:
         """Cancel processing for a session."""
         if session_id in self._cancel_flags:
             self._cancel_flags[session_id].set()
+            job = self._processing_jobs.get(session_id)
+            if job is not None and job.cancel():
+                # Still queued: it will never run to report the cancellation itself
+                self._handle_cancellation(session_id)
+            for process in list(self._processes.get(session_id, ())):
+                process.terminate()
             return True
         return False
     
@@ -714,8 +1490,8 @@ class ColmapProcessor:
         """Clean up session data and temporary files."""
         try:
             # Cancel processing if still running
-            if session_id in self._processing_threads:
-                if self._processing_threads[session_id].is_alive() and not force:
+            if session_id in self._processing_jobs:
+                if not self._processing_jobs[session_id].done() and not force:
                     return False
                 self.cancel_processing(session_id)
             
@@ -727,10 +1503,13 @@ class ColmapProcessor:
             # Clean up tracking data
             if session_id in self._progress:
                 del self._progress[session_id]
-            if session_id in self._processing_threads:
-                del self._processing_threads[session_id]
+            if session_id in self._processing_jobs:
+                del self._processing_jobs[session_id]
             if session_id in self._cancel_flags:
                 del self._cancel_flags[session_id]
+            self._processes.pop(session_id, None)
+            self._progress_views.pop(session_id, None)
+            self._pending_progress.pop(session_id, None)
             
             return True
         except Exception as e:
@@ -752,6 +1531,69 @@ def create_colmap_processor(base_output_dir: str, **kwargs) -> ColmapProcessor:
     return ColmapProcessor(base_output_dir, **kwargs)
 
 
+def downscale_image(src: str, dst: str, max_size: int) -> bool:
+    """
+    Write a JPEG copy of an image scaled to fit within max_size, if it is larger.
+    
+    EXIF data is carried over so COLMAP still reads the focal length prior.
+    
+    Args:
+        src: Source image path
+        dst: Destination path for the scaled copy
+        max_size: Largest allowed width or height
+        
+    Returns:
+        True if a scaled copy was written, False if the image already fits
+    """
+    with Image.open(src) as image:
+        if max(image.size) <= max_size:
+            return False
+        exif = image.info.get('exif')
+        # Let the JPEG decoder skip detail that would be thrown away anyway;
+        # draft() only keeps a scale at which both sides still cover the
+        # requested size, so ask for the image's own aspect ratio
+        width, height = image.size
+        scale = max_size / max(width, height)
+        image.draft('RGB', (math.ceil(width * scale), math.ceil(height * scale)))
+        image.thumbnail((max_size, max_size), Image.LANCZOS)
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        save_options = {'quality': 92}
+        if exif:
+            save_options['exif'] = exif
+        image.save(dst, 'JPEG', **save_options)
+    return True
+
+
+def copy_file_fast(src: str, dst: str):
+    """
+    Copy a file and its metadata, letting the kernel move the data where possible.
+    
+    os.copy_file_range copies without passing through user space and can
+    share blocks outright on copy-on-write filesystems (Btrfs, XFS reflink).
+    Falls back to shutil.copy2 where it is unavailable or unsupported.
+    
+    Args:
+        src: Source file path
+        dst: Destination file path
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return
+        except OSError:
+            pass  # e.g. EXDEV on older kernels or ENOSYS; copy2 below handles it
+    shutil.copy2(src, dst)
+
+
 def validate_image_set(image_files: List[str]) -> Tuple[bool, str]:
     """
     Validate a set of images for COLMAP processing.
@@ -774,12 +1616,14 @@ def validate_image_set(image_files: List[str]) -> Tuple[bool, str]:
     else:
         validation_msg = f"Image set validation passed: {len(image_files)} images"
     
-    # Check if files exist and are accessible
+    # Check if files exist and are accessible. access() answers both in one
+    # syscall per file; a directory listing could confirm existence but not
+    # readability, which depends on each file's owner and mode, so it would
+    # not save the per-file call
     for image_path in image_files:
-        if not os.path.exists(image_path):
-            return False, f"Image file not found: {image_path}"
-        
         if not os.access(image_path, os.R_OK):
+            if not os.path.exists(image_path):
+                return False, f"Image file not found: {image_path}"
             return False, f"Image file not readable: {image_path}"
     
     return True, validation_msg
\ No newline at end of file
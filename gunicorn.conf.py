@@ -0,0 +1,43 @@
+"""
+Gunicorn configuration for the 3D Photogrammetry application.
+
+The default worker class is gthread: each worker process serves requests on a
+pool of real OS threads. The app runs COLMAP monitoring, model conversion and
+other CPU-heavy work on threads inside the worker, so it must not use gevent
+(or eventlet) workers - their monkey-patching turns those threads into
+greenlets, and one long conversion would block every request on the worker,
+/status and the status stream included. Each open status stream holds a
+thread until it ends (after at most STATUS_STREAM_MAX_SECONDS, when the client
+reconnects), so size GUNICORN_THREADS for the expected number of watchers.
+
+Run a single worker process. Only session status is shared between processes
+(through the SQLite status store, STATUS_DB); the processing queue, COLMAP
+progress, cancel flags, the GPU slot and the result caches live in the
+process that started a job, so with several workers PROCESSING_WORKERS and
+GPU serialisation only hold per process, and /colmap/status, /colmap/cancel,
+/colmap/cleanup and detailed progress fail or go stale on the other workers.
+Scale with GUNICORN_THREADS instead.
+
+Usage:
+    gunicorn -c gunicorn.conf.py app:app
+
+CPU-heavy /preprocess requests can be routed to a separate sync instance:
+    GUNICORN_WORKER_CLASS=sync GUNICORN_WORKERS=2 GUNICORN_BIND=127.0.0.1:5001 \\
+        gunicorn -c gunicorn.conf.py app:app
+"""
+
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', '1'))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', '64'))
+
+# Large multi-image uploads and archive downloads can take a while
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
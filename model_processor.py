@@ -12,19 +12,132 @@ Features:
 - Metadata extraction (vertex count, file size, etc.)
 """
 
+import io
 import os
 import sys
 import json
 import zipfile
+import mmap
+import shutil
 import logging
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass, asdict
 import struct
 import re
 
+import numpy as np
+
+
+# NumPy type codes for PLY property types (byte order is added from the format line)
+PLY_DTYPES = {
+    'char': 'i1', 'int8': 'i1', 'uchar': 'u1', 'uint8': 'u1',
+    'short': 'i2', 'int16': 'i2', 'ushort': 'u2', 'uint16': 'u2',
+    'int': 'i4', 'int32': 'i4', 'uint': 'u4', 'uint32': 'u4',
+    'float': 'f4', 'float32': 'f4', 'double': 'f8', 'float64': 'f8'
+}
+
+
+def _skip_lines(data: bytes, start: int, count: int) -> int:
+    """
+    Find the end of a block of text lines.
+    
+    Args:
+        data: Text to scan
+        start: Offset the block starts at
+        count: Number of lines in the block
+        
+    Returns:
+        Offset just past the block's last newline, or len(data) if it has fewer lines
+    """
+    if count <= 0:
+        return start
+    newlines = np.flatnonzero(np.frombuffer(data, dtype=np.uint8, offset=start) == ord('\n'))
+    if len(newlines) < count:
+        return len(data)
+    return start + int(newlines[count - 1]) + 1
+
+
+# Property names (or name suffixes, as in diffuse_red) that mark colors and normals
+PLY_COLOR_PROPERTIES = frozenset(('red', 'green', 'blue'))
+PLY_NORMAL_PROPERTIES = frozenset(('nx', 'ny', 'nz'))
+
+
+def _parse_format(fields: List[str], header_info: Dict[str, Any]) -> None:
+    """Handle a PLY 'format <type> <version>' header line."""
+    header_info['format'] = fields[0]
+
+
+def _parse_element(fields: List[str], header_info: Dict[str, Any]) -> None:
+    """Handle a PLY 'element <name> <count>' header line."""
+    name, count = fields[0], int(fields[1])
+    header_info['elements'].append({'name': name, 'count': count, 'properties': []})
+    if name == 'vertex':
+        header_info['vertex_count'] = count
+    elif name == 'face':
+        header_info['face_count'] = count
+
+
+def _parse_property(fields: List[str], header_info: Dict[str, Any]) -> None:
+    """Handle a PLY 'property <type> <name>' or 'property list <count> <type> <name>' line."""
+    if fields[0] == 'list':
+        prop = (fields[3], fields[2], fields[1])
+    else:
+        prop = (fields[1], fields[0], None)
+    if header_info['elements']:
+        header_info['elements'][-1]['properties'].append(prop)
+    
+    suffix = prop[0].rpartition('_')[2]
+    if suffix in PLY_COLOR_PROPERTIES:
+        header_info['has_colors'] = True
+    elif suffix in PLY_NORMAL_PROPERTIES:
+        header_info['has_normals'] = True
+
+
+# Header line handlers keyed on the line's first word
+PLY_HEADER_HANDLERS = {
+    'format': _parse_format,
+    'element': _parse_element,
+    'property': _parse_property
+}
+
+
+# Rows formatted per write call when emitting OBJ element lines
+WRITE_CHUNK_ROWS = 65536
+
+# Material file written alongside OBJ files with vertex colors
+DEFAULT_MTL = (
+    "# Material file\n"
+    "newmtl material0\n"
+    "Ka 0.2 0.2 0.2\n"
+    "Kd 0.8 0.8 0.8\n"
+    "Ks 0.1 0.1 0.1\n"
+    "Ns 10.0\n"
+)
+
+
+def _write_rows(f, fmt: str, rows: np.ndarray, colors: Optional[np.ndarray] = None,
+                color_range: float = 1.0) -> None:
+    """
+    Write array rows as formatted text lines in buffered chunks.
+    
+    Args:
+        f: Text file to write to
+        fmt: printf-style format for one line, including the newline
+        rows: 2D array with one row per line
+        colors: Optional per-row color columns appended to each line
+        color_range: Full-scale color value; colors are divided by it chunk by
+            chunk, so a float copy of all colors is never built
+    """
+    for start in range(0, len(rows), WRITE_CHUNK_ROWS):
+        chunk = rows[start:start + WRITE_CHUNK_ROWS]
+        if colors is not None:
+            chunk = np.hstack([chunk, colors[start:start + WRITE_CHUNK_ROWS] / color_range])
+        f.write(''.join([fmt % tuple(row) for row in chunk.tolist()]))
+
 
 @dataclass
 class ModelMetadata:
@@ -80,59 +193,60 @@ class ModelProcessor:
                 'face_count': 0,
                 'has_colors': False,
                 'has_normals': False,
-                'format': 'unknown'
+                'format': 'unknown',
+                # Elements in file order: {'name', 'count', 'properties'}, each
+                # property a (name, type, list count type or None) tuple
+                'elements': [],
+                # Byte offset of the data following end_header
+                'body_offset': 0
             }
             
-            with open(ply_path, 'rb') as f:
-                line = f.readline().decode('ascii').strip()
+            # Text mode decodes the header in C; latin-1 maps every byte, so the
+            # read-ahead into a binary body cannot fail to decode
+            with open(ply_path, 'r', encoding='latin-1', newline='\n') as f:
+                line = f.readline().strip()
                 if line != 'ply':
                     raise ModelProcessingError("Invalid PLY file format")
                 
                 while True:
-                    line = f.readline().decode('ascii').strip()
+                    raw_line = f.readline()
+                    if not raw_line:
+                        raise ModelProcessingError("PLY header is missing end_header")
+                    line = raw_line.strip()
                     if line == 'end_header':
+                        header_info['body_offset'] = f.tell()
                         break
                     
-                    if line.startswith('format'):
-                        header_info['format'] = line.split()[1]
-                    elif line.startswith('element vertex'):
-                        header_info['vertex_count'] = int(line.split()[2])
-                    elif line.startswith('element face'):
-                        header_info['face_count'] = int(line.split()[2])
-                    elif 'red' in line or 'green' in line or 'blue' in line:
-                        header_info['has_colors'] = True
-                    elif 'nx' in line or 'ny' in line or 'nz' in line:
-                        header_info['has_normals'] = True
+                    # Dispatch on the keyword; comments and obj_info are ignored
+                    keyword, _, rest = line.partition(' ')
+                    handler = PLY_HEADER_HANDLERS.get(keyword)
+                    if handler:
+                        handler(rest.split(), header_info)
             
             return header_info
             
         except Exception as e:
             raise ModelProcessingError(f"Failed to read PLY header: {str(e)}")
     
-    def calculate_bounding_box(self, vertices: List[Tuple[float, float, float]]) -> Dict[str, Tuple[float, float, float]]:
-        """Calculate bounding box from vertices."""
-        if not vertices:
+    def calculate_bounding_box(self, vertices: Union[np.ndarray, List[Tuple[float, float, float]]]) -> Dict[str, Tuple[float, float, float]]:
+        """Calculate bounding box from vertices (a list of tuples or an (N, 3) array)."""
+        points = np.asarray(vertices, dtype=np.float64)
+        if points.size == 0:
             return {
                 'min': (0.0, 0.0, 0.0),
                 'max': (0.0, 0.0, 0.0),
                 'center': (0.0, 0.0, 0.0)
             }
         
-        min_x = min(v[0] for v in vertices)
-        max_x = max(v[0] for v in vertices)
-        min_y = min(v[1] for v in vertices)
-        max_y = max(v[1] for v in vertices)
-        min_z = min(v[2] for v in vertices)
-        max_z = max(v[2] for v in vertices)
-        
-        center_x = (min_x + max_x) / 2
-        center_y = (min_y + max_y) / 2
-        center_z = (min_z + max_z) / 2
+        # One vectorised reduction per bound instead of six passes over the vertices
+        minimum = points.min(axis=0)
+        maximum = points.max(axis=0)
+        center = (minimum + maximum) / 2
         
         return {
-            'min': (min_x, min_y, min_z),
-            'max': (max_x, max_y, max_z),
-            'center': (center_x, center_y, center_z)
+            'min': tuple(minimum.tolist()),
+            'max': tuple(maximum.tolist()),
+            'center': tuple(center.tolist())
         }
     
     def convert_ply_to_obj(self, ply_path: Path, output_dir: Path) -> Tuple[Path, ModelMetadata]:
@@ -146,6 +260,20 @@ class ModelProcessor:
         Returns:
             Tuple of (obj_path, metadata)
         """
+        obj_path, metadata, _, _ = self._convert_ply(ply_path, output_dir)
+        return obj_path, metadata
+    
+    def _convert_ply(self, ply_path: Path, output_dir: Path) -> Tuple[Path, ModelMetadata, np.ndarray, np.ndarray]:
+        """
+        Convert PLY file to OBJ format, keeping the parsed geometry.
+        
+        Args:
+            ply_path: Path to input PLY file
+            output_dir: Output directory for OBJ files
+            
+        Returns:
+            Tuple of (obj_path, metadata, (N, 3) vertices, (M, 3) 1-based faces)
+        """
         try:
             self.logger.info(f"Converting PLY to OBJ: {ply_path}")
             
@@ -160,84 +288,83 @@ class ModelProcessor:
             obj_path = output_dir / f"{ply_path.stem}.obj"
             mtl_path = output_dir / f"{ply_path.stem}.mtl"
             
-            vertices = []
-            faces = []
-            colors = []
+            # Parsed model as arrays: (N, 3) coordinates, (N, 3) 0-255 colors
+            # (uint8 for uchar channels, empty without colors) and (M, 3)
+            # 1-based triangle indices; colors are normalised only when written
+            vertices = np.empty((0, 3))
+            faces = np.empty((0, 3), dtype=np.int32)
+            colors = np.empty((0, 3), dtype=np.uint8)
             
             # Parse PLY file
             with open(ply_path, 'rb') as f:
                 # Skip header
-                while True:
-                    line = f.readline().decode('ascii').strip()
-                    if line == 'end_header':
-                        break
+                f.seek(header_info['body_offset'])
                 
                 # Read vertices
                 vertex_count = header_info['vertex_count']
                 has_colors = header_info['has_colors']
                 
+                vertex_element = self._find_element(header_info, 'vertex')
+                
                 if header_info['format'] == 'ascii':
-                    # ASCII format
-                    for i in range(vertex_count):
-                        line = f.readline().decode('ascii').strip()
-                        parts = line.split()
+                    # ASCII format: hand each whole block to NumPy's C parser
+                    # instead of splitting and converting value by value
+                    body = f.read()
+                    vertex_end = _skip_lines(body, 0, vertex_count)
+                    if vertex_count > 0:
+                        vertex_data = np.loadtxt(io.BytesIO(body[:vertex_end]), ndmin=2)
                         
-                        # Extract coordinates
-                        x, y, z = float(parts[0]), float(parts[1]), float(parts[2])
-                        vertices.append((x, y, z))
+                        # Extract coordinates, by property name when the header lists them
+                        names = [prop[0] for prop in vertex_element['properties']] if vertex_element else []
+                        xyz = [names.index(n) for n in ('x', 'y', 'z')] if {'x', 'y', 'z'} <= set(names) else [0, 1, 2]
+                        vertices = vertex_data[:, xyz]
                         
                         # Extract colors if available
-                        if has_colors and len(parts) >= 6:
-                            r, g, b = int(parts[3]), int(parts[4]), int(parts[5])
-                            colors.append((r/255.0, g/255.0, b/255.0))
+                        if {'red', 'green', 'blue'} <= set(names):
+                            rgb = [names.index(n) for n in ('red', 'green', 'blue')]
+                            colors = vertex_data[:, rgb]
+                            if all(PLY_DTYPES.get(vertex_element['properties'][i][1]) == 'u1' for i in rgb):
+                                colors = colors.astype(np.uint8)
+                        elif has_colors and vertex_data.shape[1] >= 6:
+                            colors = vertex_data[:, 3:6]
+                    
+                    # Read faces
+                    face_count = header_info['face_count']
+                    face_end = _skip_lines(body, vertex_end, face_count)
+                    if face_count > 0:
+                        faces = self._parse_ascii_faces(body[vertex_end:face_end])
                 
-                else:
-                    # Binary format (simplified)
-                    self.logger.warning("Binary PLY format detected, using simplified parsing")
-                    # For binary PLY, we'd need more complex parsing
-                    # For now, skip to avoid complexity
+                elif header_info['format'] in ('binary_little_endian', 'binary_big_endian'):
+                    # Binary format: fixed-size records map straight onto a NumPy dtype
+                    vertices, color_array, faces = self._read_binary_ply(f, header_info)
+                    if color_array is not None:
+                        colors = color_array
                 
-                # Read faces
-                face_count = header_info['face_count']
-                for i in range(face_count):
-                    if header_info['format'] == 'ascii':
-                        line = f.readline().decode('ascii').strip()
-                        parts = line.split()
-                        if len(parts) >= 4 and parts[0] == '3':  # Triangle
-                            # OBJ uses 1-based indexing
-                            v1, v2, v3 = int(parts[1]) + 1, int(parts[2]) + 1, int(parts[3]) + 1
-                            faces.append((v1, v2, v3))
+                else:
+                    raise ModelProcessingError(f"Unsupported PLY format: {header_info['format']}")
             
             # Write OBJ file
+            header = (f"# OBJ file generated from {ply_path.name}\n"
+                      f"# Vertices: {len(vertices)}, Faces: {len(faces)}\n")
+            if mtl_path.exists() or len(colors):
+                header += f"mtllib {mtl_path.name}\nusemtl material0\n"
+            
             with open(obj_path, 'w') as f:
-                f.write(f"# OBJ file generated from {ply_path.name}\n")
-                f.write(f"# Vertices: {len(vertices)}, Faces: {len(faces)}\n")
+                f.write(header)
                 
-                if mtl_path.exists() or colors:
-                    f.write(f"mtllib {mtl_path.name}\n")
-                    f.write("usemtl material0\n")
-                
-                # Write vertices
-                for i, (x, y, z) in enumerate(vertices):
-                    f.write(f"v {x:.6f} {y:.6f} {z:.6f}")
-                    if i < len(colors):
-                        r, g, b = colors[i]
-                        f.write(f" {r:.6f} {g:.6f} {b:.6f}")
-                    f.write("\n")
+                # Write vertices, with per-vertex colors where available
+                colored = min(len(colors), len(vertices))
+                _write_rows(f, "v %.6f %.6f %.6f %.6f %.6f %.6f\n",
+                            vertices[:colored], colors[:colored], color_range=255.0)
+                _write_rows(f, "v %.6f %.6f %.6f\n", vertices[colored:])
                 
                 # Write faces
-                for v1, v2, v3 in faces:
-                    f.write(f"f {v1} {v2} {v3}\n")
+                _write_rows(f, "f %d %d %d\n", faces)
             
             # Write MTL file if we have colors
-            if colors:
+            if len(colors):
                 with open(mtl_path, 'w') as f:
-                    f.write("# Material file\n")
-                    f.write("newmtl material0\n")
-                    f.write("Ka 0.2 0.2 0.2\n")
-                    f.write("Kd 0.8 0.8 0.8\n")
-                    f.write("Ks 0.1 0.1 0.1\n")
-                    f.write("Ns 10.0\n")
+                    f.write(DEFAULT_MTL)
             
             # Calculate bounding box
             bounding_box = self.calculate_bounding_box(vertices)
@@ -256,17 +383,181 @@ class ModelProcessor:
             )
             
             self.logger.info(f"PLY to OBJ conversion completed: {obj_path}")
-            return obj_path, metadata
+            return obj_path, metadata, vertices, faces
             
         except Exception as e:
             raise ModelProcessingError(f"PLY to OBJ conversion failed: {str(e)}")
     
-    def clean_mesh(self, obj_path: Path) -> Path:
+    @staticmethod
+    def _find_element(header_info: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
+        """Return the header entry of the named PLY element, or None."""
+        for element in header_info.get('elements', []):
+            if element['name'] == name:
+                return element
+        return None
+    
+    def _read_binary_ply(self, f, header_info: Dict[str, Any]) -> Tuple[np.ndarray, Optional[np.ndarray], np.ndarray]:
+        """
+        Read vertices, colors and triangles from a binary PLY body.
+        
+        Args:
+            f: Binary PLY file positioned just after end_header
+            header_info: Result of read_ply_header for the file
+            
+        Returns:
+            Tuple of ((N, 3) coordinates, (N, 3) 0-255 colors or None,
+            (M, 3) 1-based triangle indices)
+        """
+        byte_order = '<' if header_info['format'] == 'binary_little_endian' else '>'
+        # Parse straight from the page cache instead of copying the body into a
+        # bytes object; every array returned is a copy, so the mapping is
+        # released with the last frombuffer view when this method returns
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        offset = f.tell()
+        
+        vertices = np.empty((0, 3))
+        colors = None
+        faces = np.empty((0, 3), dtype=np.int32)
+        
+        for element in header_info['elements']:
+            if element['name'] == 'face':
+                faces, offset = self._read_binary_faces(data, offset, element, byte_order)
+                continue
+            
+            if any(count_type for _, _, count_type in element['properties']):
+                # Records of varying size can only be skipped by walking them
+                self.logger.warning(f"Stopping at PLY element '{element['name']}' with list properties")
+                break
+            
+            record = np.dtype([(name, byte_order + PLY_DTYPES[ply_type])
+                               for name, ply_type, _ in element['properties']])
+            size = record.itemsize * element['count']
+            if len(data) - offset < size:
+                raise ModelProcessingError(f"PLY file truncated in element '{element['name']}'")
+            
+            if element['name'] == 'vertex':
+                records = np.frombuffer(data, dtype=record, count=element['count'], offset=offset)
+                vertices = np.stack([records[axis] for axis in ('x', 'y', 'z')], axis=1).astype(np.float64)
+                if {'red', 'green', 'blue'} <= set(record.names):
+                    colors = np.stack([records[channel] for channel in ('red', 'green', 'blue')], axis=1)
+            offset += size
+        
+        return vertices, colors, faces
+    
+    def _read_binary_faces(self, data: mmap.mmap, offset: int, element: Dict[str, Any],
+                           byte_order: str) -> Tuple[np.ndarray, int]:
+        """
+        Read the triangles of a binary PLY face element.
+        
+        Args:
+            data: Mapped PLY file
+            offset: Offset of the face element in data
+            element: Header entry of the face element
+            byte_order: '<' or '>'
+            
+        Returns:
+            Tuple of ((M, 3) 1-based triangle indices, offset after the element)
+        """
+        count = element['count']
+        index_name = next(name for name, _, count_type in element['properties'] if count_type)
+        
+        # Fast path: every face is a triangle, so every record has the same size
+        fields = []
+        for name, ply_type, count_type in element['properties']:
+            if count_type:
+                fields.append((f"{name}_count", byte_order + PLY_DTYPES[count_type]))
+                fields.append((name, byte_order + PLY_DTYPES[ply_type], (3,)))
+            else:
+                fields.append((name, byte_order + PLY_DTYPES[ply_type]))
+        record = np.dtype(fields)
+        if len(data) - offset >= record.itemsize * count:
+            records = np.frombuffer(data, dtype=record, count=count, offset=offset)
+            if np.all(records[f"{index_name}_count"] == 3):
+                return records[index_name].astype(np.int32) + 1, offset + record.itemsize * count
+        
+        # Mixed polygons: walk the records one by one and keep the triangles,
+        # filling an array sized for the face count and trimming it afterwards
+        triangles = np.empty((count, 3), dtype=np.int32)
+        kept = 0
+        for _ in range(count):
+            for name, ply_type, count_type in element['properties']:
+                item = np.dtype(byte_order + PLY_DTYPES[ply_type])
+                if count_type is None:
+                    offset += item.itemsize
+                    continue
+                length_type = np.dtype(byte_order + PLY_DTYPES[count_type])
+                length = int(np.frombuffer(data, dtype=length_type, count=1, offset=offset)[0])
+                offset += length_type.itemsize
+                if name == index_name and length == 3:
+                    triangles[kept] = np.frombuffer(data, dtype=item, count=3, offset=offset)
+                    kept += 1
+                offset += item.itemsize * length
+        return triangles[:kept] + 1, offset
+    
+    def _parse_ascii_faces(self, face_block: bytes) -> np.ndarray:
+        """
+        Parse the triangles out of an ASCII PLY face block.
+        
+        Args:
+            face_block: Face lines of the PLY body ("3 i j k" per triangle)
+            
+        Returns:
+            (M, 3) array of 1-based vertex indices, as OBJ expects
+        """
+        try:
+            face_data = np.loadtxt(io.BytesIO(face_block), dtype=np.int64, ndmin=2)
+        except ValueError:
+            # Rows of different lengths (triangles mixed with other polygons)
+            triangles = []
+            for line in face_block.split(b'\n'):
+                parts = line.split()
+                if len(parts) >= 4 and parts[0] == b'3':  # Triangle
+                    triangles.append((int(parts[1]), int(parts[2]), int(parts[3])))
+            return np.array(triangles, dtype=np.int32).reshape(-1, 3) + 1
+        
+        if face_data.shape[1] < 4:
+            return np.empty((0, 3), dtype=np.int32)
+        # Keep triangles; OBJ uses 1-based indexing
+        return face_data[face_data[:, 0] == 3, 1:4].astype(np.int32) + 1
+    
+    @staticmethod
+    def _parse_obj_faces(face_lines: List[bytes]) -> np.ndarray:
+        """
+        Parse the first three vertex indices of each OBJ face line.
+        
+        Args:
+            face_lines: "f ..." lines of an OBJ file
+            
+        Returns:
+            (M, 3) array of 0-based vertex indices
+        """
+        if not face_lines:
+            return np.empty((0, 3), dtype=np.int32)
+        try:
+            return np.loadtxt(face_lines, dtype=np.int32, usecols=(1, 2, 3), ndmin=2) - 1
+        except ValueError:
+            # Faces with texture/normal indices ("v/vt/vn") or malformed lines
+            faces = []
+            for line in face_lines:
+                parts = line.split()[1:]
+                if len(parts) >= 3:
+                    try:
+                        # Take only first 3 for triangles
+                        faces.append([int(part.split(b'/')[0]) - 1 for part in parts[:3]])
+                    except ValueError:
+                        continue
+            return np.array(faces, dtype=np.int32).reshape(-1, 3)
+    
+    def clean_mesh(self, obj_path: Path, vertices: Optional[np.ndarray] = None,
+                   faces: Optional[np.ndarray] = None) -> Path:
         """
         Apply basic mesh cleaning operations.
         
         Args:
             obj_path: Path to OBJ file
+            vertices: (N, 3) vertices of the OBJ, if already in memory
+            faces: (M, 3) 1-based faces of the OBJ, if already in memory;
+                the file is parsed only when these are not given
             
         Returns:
             Path to cleaned OBJ file
@@ -274,60 +565,32 @@ class ModelProcessor:
         try:
             self.logger.info(f"Cleaning mesh: {obj_path}")
             
-            # For basic cleaning, we'll implement:
-            # 1. Remove duplicate vertices
-            # 2. Remove degenerate faces
-            # 3. Merge nearby vertices (optional)
+            if vertices is None or faces is None:
+                with open(obj_path, 'rb') as f:
+                    lines = [line.strip() for line in f.read().splitlines()]
+                vertex_lines = [line for line in lines if line.startswith(b'v ')]
+                face_lines = [line for line in lines if line.startswith(b'f ')]
+                
+                vertices = np.empty((0, 3))
+                if vertex_lines:
+                    vertices = np.loadtxt(vertex_lines, usecols=(1, 2, 3), ndmin=2)
+                faces = self._parse_obj_faces(face_lines)
+            else:
+                faces = faces - 1
             
-            vertices = []
-            faces = []
-            vertex_map = {}  # For duplicate removal
-            
-            with open(obj_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('v '):
-                        # Parse vertex
-                        parts = line.split()
-                        x, y, z = float(parts[1]), float(parts[2]), float(parts[3])
-                        
-                        # Check for duplicates (with small tolerance)
-                        vertex_key = (round(x, 6), round(y, 6), round(z, 6))
-                        if vertex_key not in vertex_map:
-                            vertex_map[vertex_key] = len(vertices)
-                            vertices.append((x, y, z))
-                    
-                    elif line.startswith('f '):
-                        # Parse face
-                        parts = line.split()[1:]
-                        if len(parts) >= 3:
-                            try:
-                                # Handle face indices (may have texture/normal info)
-                                face_vertices = []
-                                for part in parts[:3]:  # Take only first 3 for triangles
-                                    vertex_idx = int(part.split('/')[0]) - 1  # Convert to 0-based
-                                    face_vertices.append(vertex_idx)
-                                
-                                # Check for degenerate faces
-                                v1, v2, v3 = face_vertices
-                                if v1 != v2 and v2 != v3 and v1 != v3:
-                                    faces.append(tuple(face_vertices))
-                            except (ValueError, IndexError):
-                                continue
+            vertices, faces = self.clean_mesh_arrays(vertices, faces)
             
             # Write cleaned OBJ
             cleaned_path = obj_path.parent / f"{obj_path.stem}_cleaned.obj"
             with open(cleaned_path, 'w') as f:
-                f.write(f"# Cleaned OBJ file\n")
-                f.write(f"# Original vertices: {len(vertices)}, Faces: {len(faces)}\n")
+                f.write(f"# Cleaned OBJ file\n"
+                        f"# Original vertices: {len(vertices)}, Faces: {len(faces)}\n")
                 
                 # Write vertices
-                for x, y, z in vertices:
-                    f.write(f"v {x:.6f} {y:.6f} {z:.6f}\n")
+                _write_rows(f, "v %.6f %.6f %.6f\n", vertices)
                 
                 # Write faces (convert back to 1-based indexing)
-                for v1, v2, v3 in faces:
-                    f.write(f"f {v1+1} {v2+1} {v3+1}\n")
+                _write_rows(f, "f %d %d %d\n", faces + 1)
             
             self.logger.info(f"Mesh cleaning completed: {cleaned_path}")
             return cleaned_path
@@ -336,6 +599,42 @@ class ModelProcessor:
             self.logger.warning(f"Mesh cleaning failed: {str(e)}")
             return obj_path  # Return original if cleaning fails
     
+    @staticmethod
+    def clean_mesh_arrays(vertices: np.ndarray, faces: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Remove duplicate vertices and degenerate faces from mesh arrays.
+        
+        Args:
+            vertices: (N, 3) vertex coordinates
+            faces: (M, 3) 0-based vertex indices
+            
+        Returns:
+            Tuple of (cleaned vertices, cleaned 0-based int32 faces)
+        """
+        # For basic cleaning, we'll implement:
+        # 1. Remove duplicate vertices
+        # 2. Remove degenerate faces
+        # 3. Merge nearby vertices (optional)
+        
+        # Remove duplicate vertices (with small tolerance), keeping each at its
+        # first occurrence so the surviving vertices stay in file order
+        _, first, inverse = np.unique(np.round(vertices, 6), axis=0,
+                                      return_index=True, return_inverse=True)
+        order = np.argsort(first)
+        remap = np.empty(len(order), dtype=np.int32)
+        remap[order] = np.arange(len(order))
+        vertices = vertices[first[order]]
+        
+        # Point faces at the merged vertices, dropping any that reference
+        # missing vertices or collapse to a line or point
+        valid = ((faces >= 0) & (faces < len(inverse))).all(axis=1)
+        faces = remap[inverse.reshape(-1)[faces[valid]]]
+        faces = faces[(faces[:, 0] != faces[:, 1]) &
+                      (faces[:, 1] != faces[:, 2]) &
+                      (faces[:, 0] != faces[:, 2])]
+        
+        return vertices, faces
+    
     def compress_model_files(self, model_dir: Path, session_id: str) -> Path:
         """
         Compress model files into a ZIP archive for web delivery.
@@ -352,12 +651,13 @@ class ModelProcessor:
             
             archive_path = model_dir.parent / f"model_{session_id}.zip"
             
-            with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            # Level 1 keeps most of DEFLATE's ratio on text models at several times the speed
+            with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
                 for file_path in model_dir.rglob('*'):
                     if file_path.is_file():
                         # Add file to archive with relative path
                         arcname = file_path.relative_to(model_dir)
-                        zipf.write(file_path, arcname)
+                        zipf.write(file_path, arcname, compress_type=self._archive_compression(file_path))
                         self.logger.debug(f"Added to archive: {arcname}")
             
             self.logger.info(f"Model compression completed: {archive_path}")
@@ -366,6 +666,62 @@ class ModelProcessor:
         except Exception as e:
             raise ModelProcessingError(f"Model compression failed: {str(e)}")
     
+    @staticmethod
+    def _archive_compression(file_path: Path) -> int:
+        """
+        Pick the ZIP compression for a model file.
+        
+        Binary PLY vertex data barely shrinks under DEFLATE, so it is stored
+        as-is; text formats (OBJ, MTL, ASCII PLY) are deflated.
+        """
+        if file_path.suffix.lower() == '.ply':
+            with open(file_path, 'rb') as f:
+                header = f.read(64)
+            if b'format binary' in header:
+                return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+    
+    def _process_one(self, ply_path: Path, output_dir: Path) -> Tuple[Path, ModelMetadata]:
+        """
+        Convert one COLMAP PLY output to a cleaned OBJ.
+        
+        Args:
+            ply_path: PLY file to convert
+            output_dir: Output directory for the OBJ files
+            
+        Returns:
+            Tuple of (cleaned_obj_path, metadata)
+        """
+        # Clean the arrays already in memory instead of re-parsing the OBJ
+        obj_path, metadata, vertices, faces = self._convert_ply(ply_path, output_dir)
+        return self.clean_mesh(obj_path, vertices, faces), metadata
+    
+    def _copy_originals(self, ply_files: List[Path], output_dir: Path) -> List[Dict[str, Any]]:
+        """
+        Copy the original PLY files next to the processed models.
+        
+        Args:
+            ply_files: PLY files to copy; missing ones are skipped
+            output_dir: Directory to copy them into
+            
+        Returns:
+            processed_files entries for the copies
+        """
+        copied = []
+        for ply_file in ply_files:
+            if ply_file.exists():
+                dest_path = output_dir / ply_file.name
+                shutil.copy2(ply_file, dest_path)
+                
+                copied.append({
+                    'type': ply_file.stem,
+                    'format': 'ply',
+                    'original_file': str(ply_file),
+                    'processed_file': str(dest_path),
+                    'metadata': {'file_size': dest_path.stat().st_size}
+                })
+        return copied
+    
     def process_colmap_output(self, session_id: str, colmap_workspace: Path) -> Dict[str, Any]:
         """
         Main method to process COLMAP output into downloadable 3D models.
@@ -387,70 +743,41 @@ class ModelProcessor:
             processed_files = []
             model_metadata = {}
             
-            # Process dense point cloud if available
+            # Dense point cloud and mesh convert independently of each other and
+            # of copying the original PLY files, so all three overlap
             dense_ply = colmap_workspace / "dense" / "fused.ply"
-            if dense_ply.exists():
-                self.logger.info("Processing dense point cloud")
-                
-                try:
-                    # Convert PLY to OBJ
-                    obj_path, metadata = self.convert_ply_to_obj(dense_ply, output_dir / "dense")
-                    
-                    # Clean mesh
-                    cleaned_obj = self.clean_mesh(obj_path)
-                    
-                    processed_files.append({
-                        'type': 'dense_pointcloud',
-                        'format': 'obj',
-                        'original_file': str(dense_ply),
-                        'processed_file': str(cleaned_obj),
-                        'metadata': asdict(metadata)
-                    })
-                    
-                    model_metadata['dense_pointcloud'] = asdict(metadata)
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to process dense point cloud: {str(e)}")
-            
-            # Process mesh if available
             mesh_ply = colmap_workspace / "mesh" / "mesh.ply"
-            if mesh_ply.exists():
-                self.logger.info("Processing mesh")
+            models = [(model_type, label, ply_path, output_dir / subdir)
+                      for model_type, label, ply_path, subdir in (
+                          ('dense_pointcloud', 'dense point cloud', dense_ply, 'dense'),
+                          ('mesh', 'mesh', mesh_ply, 'mesh'))
+                      if ply_path.exists()]
+            
+            with ThreadPoolExecutor(max_workers=len(models) + 1) as executor:
+                futures = []
+                for model_type, label, ply_path, model_dir in models:
+                    self.logger.info(f"Processing {label}")
+                    futures.append(executor.submit(self._process_one, ply_path, model_dir))
+                copy_future = executor.submit(self._copy_originals, [dense_ply, mesh_ply], output_dir)
                 
-                try:
-                    # Convert PLY to OBJ
-                    obj_path, metadata = self.convert_ply_to_obj(mesh_ply, output_dir / "mesh")
-                    
-                    # Clean mesh
-                    cleaned_obj = self.clean_mesh(obj_path)
-                    
-                    processed_files.append({
-                        'type': 'mesh',
-                        'format': 'obj',
-                        'original_file': str(mesh_ply),
-                        'processed_file': str(cleaned_obj),
-                        'metadata': asdict(metadata)
-                    })
-                    
-                    model_metadata['mesh'] = asdict(metadata)
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to process mesh: {str(e)}")
-            
-            # Copy original PLY files
-            for ply_file in [dense_ply, mesh_ply]:
-                if ply_file.exists():
-                    dest_path = output_dir / ply_file.name
-                    import shutil
-                    shutil.copy2(ply_file, dest_path)
-                    
-                    processed_files.append({
-                        'type': ply_file.stem,
-                        'format': 'ply',
-                        'original_file': str(ply_file),
-                        'processed_file': str(dest_path),
-                        'metadata': {'file_size': dest_path.stat().st_size}
-                    })
+                for (model_type, label, ply_path, _), future in zip(models, futures):
+                    try:
+                        cleaned_obj, metadata = future.result()
+                        
+                        processed_files.append({
+                            'type': model_type,
+                            'format': 'obj',
+                            'original_file': str(ply_path),
+                            'processed_file': str(cleaned_obj),
+                            'metadata': asdict(metadata)
+                        })
+                        
+                        model_metadata[model_type] = asdict(metadata)
+                        
+                    except Exception as e:
+                        self.logger.error(f"Failed to process {label}: {str(e)}")
+                
+                processed_files.extend(copy_future.result())
             
             # Create metadata file
             metadata_file = output_dir / "model_metadata.json"
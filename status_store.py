@@ -0,0 +1,97 @@
+"""
+Session Status Persistence
+
+This module provides a small SQLite-backed store for per-session processing
+status so that status survives application restarts and can be shared between
+several worker processes serving the same upload/output folders.
+
+Features:
+- One JSON row per session, replaced atomically on every update
+- WAL journaling so readers never block the writer
+- Time-to-live expiry of old sessions, purged at startup and every
+  PURGE_INTERVAL_WRITES writes
+"""
+
+import json
+import time
+import sqlite3
+import itertools
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Any
+
+
+class StatusStore:
+    """
+    SQLite-backed store for session status snapshots.
+
+    Each thread uses its own connection; SQLite handles cross-process locking.
+    """
+
+    # Expired sessions are purged once per this many writes
+    PURGE_INTERVAL_WRITES = 1000
+
+    def __init__(self, db_path: str, ttl_seconds: int = 24 * 60 * 60):
+        """
+        Initialize the status store.
+
+        Args:
+            db_path: Path to the SQLite database file
+            ttl_seconds: Age after which a session's status is discarded
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._write_count = itertools.count(1)
+
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS session_status ("
+                " session_id TEXT PRIMARY KEY,"
+                " snapshot TEXT NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+        self.purge_expired()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the calling thread's database connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get the stored status snapshot for a session, or None if unknown/expired."""
+        row = self._connection().execute(
+            "SELECT snapshot FROM session_status WHERE session_id = ? AND updated_at >= ?",
+            (session_id, time.time() - self.ttl_seconds)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, session_id: str, snapshot: Dict[str, Any]):
+        """Store the status snapshot for a session, replacing any previous one."""
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO session_status (session_id, snapshot, updated_at) VALUES (?, ?, ?)",
+                (session_id, json.dumps(snapshot), time.time())
+            )
+        if next(self._write_count) % self.PURGE_INTERVAL_WRITES == 0:
+            self.purge_expired()
+
+    def purge_expired(self) -> int:
+        """Delete sessions older than the TTL and return how many were removed."""
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM session_status WHERE updated_at < ?",
+                (time.time() - self.ttl_seconds,)
+            )
+        if cursor.rowcount:
+            self.logger.info(f"Purged {cursor.rowcount} expired session status records")
+        return cursor.rowcount
@@ -15,37 +15,158 @@ Requirements:
     - Flask app running on localhost:5000
     - Test images in the specified directory (default: test_images/)
     - requests library: pip install requests
+    - Optional: requests-toolbelt to stream uploads instead of buffering them
 """
 
 import os
 import sys
 import time
 import json
+import mmap
+import hashlib
+import itertools
 import requests
-from pathlib import Path
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Stream multipart uploads from the open files when requests-toolbelt is
+# installed - fall back to letting requests build the whole body in memory
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+# Parse and build JSON bodies with orjson when installed - fall back to json otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+loads_json = orjson.loads if orjson is not None else json.loads
+
+
+def response_json(response: requests.Response) -> Any:
+    """Decode a response's JSON body, with orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass  # Let requests raise its own error, which callers already handle
+    return response.json()
+
+# Image suffixes matched against lowercased file names with a single endswith()
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.tiff', '.tif', '.bmp')
+
+
+class _LazyImageFile:
+    """
+    Image file that opens on its first read and closes once read to the end.
+    
+    Multipart bodies read their parts one after another, so an upload of any
+    size holds a single file descriptor at a time instead of one per image.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.len = os.path.getsize(path)  # Lets the multipart encoder size the body up front
+        self._file = None
+        self._finished = False
+    
+    def read(self, size: int = -1) -> bytes:
+        if self._finished:
+            return b''
+        if self._file is None:
+            self._file = open(self.path, 'rb')
+        data = self._file.read(size)
+        if not data or size is None or size < 0:
+            self.close()
+        return data
+    
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._finished = True
 
 
 class ColmapTestClient:
     """Test client for COLMAP integration."""
     
+    # Keep-alive connections per host, enough for every parallel upload batch
+    # and download; idempotent requests retry with backoff on connection
+    # errors and gateway/unavailable responses
+    POOL_SIZE = 16
+    RETRY_POLICY = Retry(total=5, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+    # /health reports a degraded service as a 503 with its report in the body,
+    # so it must come straight back rather than be retried
+    HEALTH_RETRY_POLICY = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 504))
+    
+    # Bytes read per chunk when streaming downloads to disk
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+    
+    # Status polling backs off from the minimum to the maximum interval (seconds)
+    # while nothing changes, and drops back to the minimum on any change
+    POLL_MIN_INTERVAL = 0.5
+    POLL_MAX_INTERVAL = 30.0
+    POLL_BACKOFF = 1.5
+    # The server ends status streams after a few minutes; wait this long before reconnecting
+    STREAM_RECONNECT_DELAY = 1.0
+    
+    # Hashes sent per /upload/precheck request (the server's UPLOAD_PRECHECK_MAX_HASHES)
+    PRECHECK_BATCH_SIZE = 5000
+    
     def __init__(self, base_url: str = "http://localhost:5000"):
         self.base_url = base_url.rstrip('/')
         self.session = requests.Session()
+        # urllib3 already sets TCP_NODELAY on its sockets, and requests sends
+        # keep-alive and gzip headers by default, so pooling is all that is added
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.POOL_SIZE,
+                              max_retries=self.RETRY_POLICY)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.mount(f"{self.base_url}/health", HTTPAdapter(max_retries=self.HEALTH_RETRY_POLICY))
+        # Last (ETag, status) seen per session, for conditional status requests
+        self._status_cache = {}
         
+    def post_json(self, path: str, payload: Dict[str, Any]) -> requests.Response:
+        """POST a JSON body to an API path, encoded with orjson when installed."""
+        if orjson is None:
+            return self.session.post(f"{self.base_url}{path}", json=payload)
+        return self.session.post(f"{self.base_url}{path}", data=orjson.dumps(payload),
+                                 headers={'Content-Type': 'application/json'})
+    
     def health_check(self) -> Dict[str, Any]:
         """Check if the API is healthy and COLMAP is available."""
         try:
             response = self.session.get(f"{self.base_url}/health")
+            if response.status_code == 503:
+                return response_json(response)
             response.raise_for_status()
-            return response.json()
+            return response_json(response)
         except requests.RequestException as e:
             print(f"Health check failed: {e}")
             return {}
     
-    def upload_images(self, image_paths: List[str]) -> Dict[str, Any]:
-        """Upload images to the server."""
+    def upload_images(self, image_paths: List[str], session_id: Optional[str] = None,
+                      sequence_start: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Upload images to the server.
+        
+        Args:
+            image_paths: Images to upload
+            session_id: Existing session to add the images to; a new one is created if None
+            sequence_start: Index of the first image within the whole set uploaded to the
+                session; the server then names files by that index alone, so batches
+                keep the set's order whatever order they arrive in
+        """
         files = []
+        fields = []
+        if session_id:
+            fields.append(('session_id', session_id))
+        if sequence_start is not None:
+            fields.append(('sequence_start', str(sequence_start)))
         
         try:
             for image_path in image_paths:
@@ -55,7 +176,7 @@ class ColmapTestClient:
                 
                 files.append(('files', (
                     os.path.basename(image_path),
-                    open(image_path, 'rb'),
+                    _LazyImageFile(image_path),
                     'image/jpeg'
                 )))
             
@@ -63,14 +184,15 @@ class ColmapTestClient:
                 raise ValueError("No valid image files found")
             
             print(f"Uploading {len(files)} images...")
-            response = self.session.post(f"{self.base_url}/upload", files=files)
-            
-            # Close file handles
-            for _, file_tuple in files:
-                file_tuple[1].close()
+            if MultipartEncoder is not None:
+                encoder = MultipartEncoder(fields=fields + files)
+                response = self.session.post(f"{self.base_url}/upload", data=encoder,
+                                             headers={'Content-Type': encoder.content_type})
+            else:
+                response = self.session.post(f"{self.base_url}/upload", data=fields, files=files)
             
             response.raise_for_status()
-            return response.json()
+            return response_json(response)
             
         except requests.RequestException as e:
             print(f"Upload failed: {e}")
@@ -78,6 +200,116 @@ class ColmapTestClient:
         except Exception as e:
             print(f"Error during upload: {e}")
             return {}
+        finally:
+            # Close file handles
+            for _, file_tuple in files:
+                file_tuple[1].close()
+    
+    def upload_images_parallel(self, image_paths: List[str], workers: int = 4) -> Dict[str, Any]:
+        """
+        Upload images as concurrent batches into one session.
+        
+        The first image creates the session; the rest are split into
+        contiguous batches posted in parallel over the pooled connections.
+        
+        Args:
+            image_paths: Images to upload
+            workers: Number of batches uploaded at once
+            
+        Returns:
+            Upload result merged over all batches, shaped like upload_images'
+        """
+        first = self.upload_images(image_paths[:1], sequence_start=0)
+        remaining = image_paths[1:]
+        if not first or 'session_id' not in first or not remaining:
+            return first
+        
+        session_id = first['session_id']
+        batch_size = -(-len(remaining) // max(1, min(workers, self.POOL_SIZE)))
+        starts = range(0, len(remaining), batch_size)
+        with ThreadPoolExecutor(max_workers=len(starts)) as executor:
+            results = list(executor.map(
+                lambda start: self.upload_images(remaining[start:start + batch_size], session_id, start + 1),
+                starts))
+        
+        return self._merge_upload_results(first, results, len(image_paths))
+    
+    @staticmethod
+    def _merge_upload_results(first: Dict[str, Any], results: List[Dict[str, Any]],
+                              expected: int) -> Dict[str, Any]:
+        """Merge batch upload results into one, shaped like upload_images'."""
+        merged = dict(first)
+        merged['uploaded_files'] = list(first.get('uploaded_files', []))
+        merged['failed_files'] = list(first.get('failed_files', []))
+        for result in results:
+            if not result:
+                print("Warning: an upload batch failed")
+                continue
+            for key in ('files_uploaded', 'files_failed', 'total_files', 'total_size'):
+                merged[key] = merged.get(key, 0) + result.get(key, 0)
+            merged['uploaded_files'].extend(result.get('uploaded_files', []))
+            merged['failed_files'].extend(result.get('failed_files', []))
+        
+        if merged['files_uploaded'] == 0:
+            merged['upload_status'] = 'failed'
+        elif merged['failed_files'] or len(merged['uploaded_files']) < expected:
+            merged['upload_status'] = 'partial'
+        else:
+            merged['upload_status'] = 'success'
+        if not merged['failed_files']:
+            del merged['failed_files']
+        return merged
+    
+    @staticmethod
+    def _hash(path: str) -> str:
+        """Hash a file's contents (128-bit BLAKE2b hex) the way /upload/precheck does."""
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return hashlib.blake2b(digest_size=16).hexdigest()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return hashlib.blake2b(mapped, digest_size=16).hexdigest()
+    
+    def upload_missing_images(self, session_id: str, image_paths: List[str]) -> Dict[str, Any]:
+        """
+        Resume an upload: send only the images the session does not have yet.
+        
+        Args:
+            session_id: Session the images were (partly) uploaded to
+            image_paths: The whole image set
+            
+        Returns:
+            Result of uploading the missing images, shaped like upload_images'
+        """
+        image_paths = [path for path in image_paths if os.path.exists(path)]
+        with ThreadPoolExecutor(max_workers=max(1, min(self.POOL_SIZE, len(image_paths)))) as executor:
+            hashes = list(executor.map(self._hash, image_paths))
+        
+        missing = set()
+        try:
+            for start in range(0, len(hashes), self.PRECHECK_BATCH_SIZE):
+                batch = hashes[start:start + self.PRECHECK_BATCH_SIZE]
+                response = self.post_json("/upload/precheck", {'session_id': session_id, 'hashes': batch})
+                response.raise_for_status()
+                missing.update(response_json(response).get('missing', []))
+        except requests.RequestException as e:
+            print(f"Upload precheck failed: {e}")
+            return {}
+        
+        missing_indices = [index for index, content_hash in enumerate(hashes) if content_hash in missing]
+        print(f"{len(image_paths) - len(missing_indices)} of {len(image_paths)} images already uploaded")
+        empty = {'session_id': session_id, 'upload_status': 'success', 'files_uploaded': 0,
+                 'files_failed': 0, 'total_files': 0, 'total_size': 0, 'uploaded_files': []}
+        if not missing_indices:
+            return empty
+        
+        # Upload each contiguous run of missing images under their indices in the
+        # whole set, so they take the names they were meant to have and sort in place
+        results = []
+        for _, run in itertools.groupby(enumerate(missing_indices), lambda pair: pair[1] - pair[0]):
+            indices = [index for _, index in run]
+            results.append(self.upload_images([image_paths[index] for index in indices], session_id,
+                                              sequence_start=indices[0]))
+        return self._merge_upload_results(empty, results, len(missing_indices))
     
     def start_processing(self, session_id: str,
                         enable_dense: bool = True,
@@ -95,18 +327,15 @@ class ColmapTestClient:
             }
             
             print(f"Starting processing for session {session_id}...")
-            response = self.session.post(
-                f"{self.base_url}/process",
-                json=data
-            )
+            response = self.post_json("/process", data)
             response.raise_for_status()
-            return response.json()
+            return response_json(response)
             
         except requests.RequestException as e:
             print(f"Processing start failed: {e}")
             if hasattr(e, 'response') and e.response is not None:
                 try:
-                    error_details = e.response.json()
+                    error_details = response_json(e.response)
                     print(f"Error details: {json.dumps(error_details, indent=2)}")
                 except:
                     print(f"Response text: {e.response.text}")
@@ -114,10 +343,20 @@ class ColmapTestClient:
     
     def get_status(self, session_id: str) -> Dict[str, Any]:
         """Get processing status using the main /status endpoint."""
+        # Revalidate with the last ETag: an unchanged status comes back as an
+        # empty 304 and the previously parsed result is returned as-is
+        cached = self._status_cache.get(session_id)
+        headers = {'If-None-Match': cached[0]} if cached else {}
         try:
-            response = self.session.get(f"{self.base_url}/status/{session_id}")
+            response = self.session.get(f"{self.base_url}/status/{session_id}", headers=headers)
+            if response.status_code == 304 and cached:
+                return cached[1]
             response.raise_for_status()
-            return response.json()
+            status_data = response_json(response)
+            etag = response.headers.get('ETag')
+            if etag:
+                self._status_cache[session_id] = (etag, status_data)
+            return status_data
         except requests.RequestException as e:
             print(f"Status check failed: {e}")
             return {}
@@ -127,7 +366,7 @@ class ColmapTestClient:
         try:
             response = self.session.get(f"{self.base_url}/download/{session_id}")
             response.raise_for_status()
-            return response.json()
+            return response_json(response)
         except requests.RequestException as e:
             print(f"Download info failed: {e}")
             return {}
@@ -135,14 +374,17 @@ class ColmapTestClient:
     def download_file(self, session_id: str, filename: str, save_path: str = None) -> bool:
         """Download an individual file from a session."""
         try:
-            response = self.session.get(f"{self.base_url}/download/{session_id}/file/{filename}")
-            response.raise_for_status()
-            
             if save_path is None:
                 save_path = filename
             
-            with open(save_path, 'wb') as f:
-                f.write(response.content)
+            # Stream to disk instead of holding the whole model in memory; leaving
+            # the block returns the connection to the pool
+            with self.session.get(f"{self.base_url}/download/{session_id}/file/{filename}",
+                                  stream=True, timeout=(5, 300)) as response:
+                response.raise_for_status()
+                with open(save_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
             
             print(f"Downloaded: {filename} -> {save_path}")
             return True
@@ -150,13 +392,95 @@ class ColmapTestClient:
             print(f"Download failed for {filename}: {e}")
             return False
     
+    def _report_status(self, status_data: Dict[str, Any], last_status: Optional[str]) -> str:
+        """Print a status update when the status changes; returns the current status."""
+        current_status = status_data.get('status', 'unknown')
+        current_message = status_data.get('message', 'No message')
+        
+        # Print status updates only when status changes
+        if current_status != last_status:
+            print(f"Status: {current_status} - {current_message}")
+            
+            # Show detailed progress if available
+            if 'detailed_progress' in status_data:
+                detailed = status_data['detailed_progress']
+                progress_percent = detailed.get('progress_percent', 0)
+                stage = detailed.get('stage', 'unknown')
+                stage_message = detailed.get('stage_message', '')
+                print(f"  Progress: {progress_percent:.1f}% ({stage}: {stage_message})")
+        
+        if current_status == 'complete':
+            print("✅ Processing completed successfully!")
+        elif current_status == 'error':
+            print("❌ Processing failed!")
+            error_msg = status_data.get('error', 'Unknown error')
+            print(f"Error: {error_msg}")
+        
+        return current_status
+    
+    def _monitor_stream(self, session_id: str, max_wait_time: float) -> Optional[Dict[str, Any]]:
+        """
+        Follow the server-sent status stream until processing finishes.
+        
+        The server closes each stream after a few minutes; the client then
+        reconnects, sending the last event id so the server resumes from it.
+        
+        Returns:
+            Final status, or None if the stream is unavailable or times out
+        """
+        deadline = time.time() + max_wait_time
+        last_status = None
+        last_event_id = None
+        
+        try:
+            while time.time() < deadline:
+                headers = {'Accept': 'text/event-stream'}
+                if last_event_id:
+                    headers['Last-Event-ID'] = last_event_id
+                with self.session.get(f"{self.base_url}/status/{session_id}/stream", stream=True,
+                                      headers=headers, timeout=(3, max_wait_time)) as response:
+                    if response.status_code == 404:
+                        return None
+                    response.raise_for_status()
+                    
+                    for line in response.iter_lines():
+                        # Keepalives arrive every few seconds and reset the read timeout,
+                        # so check the deadline on every line or a stalled session never ends
+                        if time.time() > deadline:
+                            return None
+                        if line.startswith(b'id:'):
+                            last_event_id = line[3:].strip().decode('ascii')
+                            continue
+                        # Skip keepalive comments, retry hints and event separators
+                        if not line.startswith(b'data:'):
+                            continue
+                        status_data = loads_json(line[5:])
+                        last_status = self._report_status(status_data, last_status)
+                        if last_status in ('complete', 'error'):
+                            return status_data
+                
+                time.sleep(min(self.STREAM_RECONNECT_DELAY, max(0.0, deadline - time.time())))
+        except requests.RequestException as e:
+            print(f"Status stream failed, polling instead: {e}")
+        
+        return None
+    
     def monitor_processing(self, session_id: str, max_wait_time: int = 600) -> Dict[str, Any]:
         """Monitor processing until completion or timeout."""
         start_time = time.time()
-        last_status = None
         
         print("Monitoring processing progress...")
         
+        # Prefer pushed updates; poll if the server has no stream endpoint
+        final_status = self._monitor_stream(session_id, max_wait_time)
+        if final_status is not None:
+            return final_status
+        
+        last_status = None
+        last_data = None
+        last_key = None
+        interval = self.POLL_MIN_INTERVAL
+        
         while time.time() - start_time < max_wait_time:
             status_data = self.get_status(session_id)
             
@@ -164,49 +488,102 @@ class ColmapTestClient:
                 print("Failed to get status")
                 break
             
-            current_status = status_data.get('status', 'unknown')
-            current_message = status_data.get('message', 'No message')
-            
-            # Print status updates only when status changes
-            if current_status != last_status:
-                print(f"Status: {current_status} - {current_message}")
-                last_status = current_status
+            # Poll quickly around transitions and back off during long stages;
+            # a 304 hands back the same object, so there is nothing to inspect
+            if status_data is last_data:
+                interval = min(interval * self.POLL_BACKOFF, self.POLL_MAX_INTERVAL)
+            else:
+                last_data = status_data
+                detailed = status_data.get('detailed_progress') or {}
+                key = (status_data.get('status'), detailed.get('stage'), int(detailed.get('progress_percent', 0)))
+                if key != last_key:
+                    interval = self.POLL_MIN_INTERVAL
+                    last_key = key
+                else:
+                    interval = min(interval * self.POLL_BACKOFF, self.POLL_MAX_INTERVAL)
                 
-                # Show detailed progress if available
-                if 'detailed_progress' in status_data:
-                    detailed = status_data['detailed_progress']
-                    progress_percent = detailed.get('progress_percent', 0)
-                    stage = detailed.get('stage', 'unknown')
-                    stage_message = detailed.get('stage_message', '')
-                    print(f"  Progress: {progress_percent:.1f}% ({stage}: {stage_message})")
-            
-            if current_status == 'complete':
-                print("✅ Processing completed successfully!")
-                return status_data
-            elif current_status == 'error':
-                print("❌ Processing failed!")
-                error_msg = status_data.get('error', 'Unknown error')
-                print(f"Error: {error_msg}")
-                return status_data
+                last_status = self._report_status(status_data, last_status)
+                if last_status in ('complete', 'error'):
+                    return status_data
             
-            time.sleep(5)  # Wait 5 seconds before next check
+            time.sleep(min(interval, max(0.0, max_wait_time - (time.time() - start_time))))
         
         print("⏰ Timeout waiting for processing to complete")
         return self.get_status(session_id)
 
 
+class MultiSessionMonitor:
+    """Follow many sessions with one /status/batch request per poll."""
+    
+    def __init__(self, client: ColmapTestClient):
+        self.client = client
+        self._callbacks = {}
+    
+    def watch(self, session_id: str, callback) -> None:
+        """
+        Add a session to follow.
+        
+        Args:
+            session_id: Session to follow
+            callback: Called as callback(session_id, status_data) whenever the status changes
+        """
+        self._callbacks[session_id] = callback
+    
+    def run(self, max_wait_time: int = 600) -> Dict[str, Dict[str, Any]]:
+        """
+        Poll every watched session until all finish or the time runs out.
+        
+        Returns:
+            Last status of each session (None if the server does not know it)
+        """
+        start_time = time.time()
+        pending = set(self._callbacks)
+        last_seen = {}
+        interval = self.client.POLL_MIN_INTERVAL
+        
+        while pending and time.time() - start_time < max_wait_time:
+            try:
+                response = self.client.post_json("/status/batch", {'session_ids': sorted(pending)})
+                response.raise_for_status()
+                statuses = response_json(response).get('statuses', {})
+            except requests.RequestException as e:
+                print(f"Batch status check failed: {e}")
+                break
+            
+            # Poll quickly while any session changes, back off while none do
+            changed = False
+            for session_id in list(pending):
+                status_data = statuses.get(session_id)
+                if status_data != last_seen.get(session_id):
+                    changed = True
+                    last_seen[session_id] = status_data
+                    self._callbacks[session_id](session_id, status_data)
+                if status_data is None or status_data.get('status') in ('complete', 'error'):
+                    pending.discard(session_id)
+            
+            if changed:
+                interval = self.client.POLL_MIN_INTERVAL
+            else:
+                interval = min(interval * self.client.POLL_BACKOFF, self.client.POLL_MAX_INTERVAL)
+            if pending:
+                time.sleep(min(interval, max(0.0, max_wait_time - (time.time() - start_time))))
+        
+        return {session_id: last_seen.get(session_id) for session_id in self._callbacks}
+
+
 def find_test_images(directory: str = "test_images") -> List[str]:
     """Find test images in the specified directory."""
     if not os.path.exists(directory):
         print(f"Test images directory not found: {directory}")
         return []
     
-    valid_extensions = {'.jpg', '.jpeg', '.png', '.tiff', '.tif', '.bmp'}
     image_files = []
     
-    for file_path in Path(directory).iterdir():
-        if file_path.is_file() and file_path.suffix.lower() in valid_extensions:
-            image_files.append(str(file_path))
+    # DirEntry.is_file() uses the d_type from readdir, so no per-file stat()
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.lower().endswith(IMAGE_EXTENSIONS) and entry.is_file():
+                image_files.append(os.path.join(directory, entry.name))
     
     return sorted(image_files)
 
@@ -278,7 +655,15 @@ def main():
     
     # Upload images
     print("\n📤 Uploading images...")
-    upload_result = client.upload_images(image_files)
+    upload_result = client.upload_images_parallel(image_files)
+    
+    if upload_result and upload_result.get('upload_status') == 'partial' and 'session_id' in upload_result:
+        # Some batches failed: resend only what the server does not have
+        print("⚠️  Some images did not upload - resuming...")
+        resumed = client.upload_missing_images(upload_result['session_id'], image_files)
+        if resumed.get('upload_status') == 'success':
+            upload_result['files_uploaded'] = len(image_files)
+            upload_result['upload_status'] = 'success'
     
     if not upload_result or upload_result.get('upload_status') != 'success':
         print("❌ Image upload failed")
@@ -314,6 +699,15 @@ def main():
         print("❌ Failed to get final results")
         return 1
     
+    # The batch status endpoint must report the same final state
+    batch_monitor = MultiSessionMonitor(client)
+    batch_monitor.watch(session_id, lambda _, status_data: None)
+    batch_status = batch_monitor.run(max_wait_time=30).get(session_id) or {}
+    if batch_status.get('status') == final_result.get('status'):
+        print(f"✅ Batch status agrees: {batch_status.get('status')}")
+    else:
+        print(f"⚠️  Batch status is {batch_status.get('status')}, expected {final_result.get('status')}")
+    
     # Display results
     print("\n📊 Final Results:")
     print("=" * 30)
@@ -354,13 +748,22 @@ def main():
             available_files = download_info['available_files']
             print(f"Available files for download: {len(available_files)}")
             
-            # Try to download a few files
+            # Try to download a few files, concurrently over the pooled connections
             download_count = 0
+            filenames = []
             for file_info in available_files[:3]:  # Download first 3 files
                 filename = os.path.basename(file_info.get('download_url', ''))
-                if filename:
+                if filename and filename not in filenames:
+                    filenames.append(filename)
+            with ThreadPoolExecutor(max_workers=max(1, min(client.POOL_SIZE, len(filenames)))) as executor:
+                futures = {
+                    executor.submit(client.download_file, session_id, filename, f"downloaded_{filename}"): filename
+                    for filename in filenames
+                }
+                for future in as_completed(futures):
+                    filename = futures[future]
                     download_path = f"downloaded_{filename}"
-                    success = client.download_file(session_id, filename, download_path)
+                    success = future.result()
                     if success:
                         download_count += 1
                         # Check downloaded file
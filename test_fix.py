@@ -3,6 +3,7 @@
 Test script to verify the COLMAP archive creation fix
 """
 
+import os
 import sys
 import logging
 from pathlib import Path
@@ -23,8 +24,12 @@ def test_colmap_fix():
         logger.error(f"Image directory not found: {image_dir}")
         return False
     
-    # Get all images from the directory
-    image_files = list(image_dir.glob("*.jpg"))
+    # Get all images from the directory, in a reproducible order; like the
+    # "*.jpg" glob this skips hidden files, without building Path objects
+    with os.scandir(image_dir) as entries:
+        image_files = sorted(os.path.join(image_dir, entry.name) for entry in entries
+                             if entry.name.endswith(".jpg") and not entry.name.startswith(".")
+                             and entry.is_file())
     if not image_files:
         logger.error("No images found in directory")
         return False
@@ -49,7 +54,7 @@ def test_colmap_fix():
         logger.info("Starting COLMAP processing...")
         result = processor.process_images(
             session_id=session_id,
-            image_files=[str(f) for f in image_files],
+            image_files=image_files,
             async_mode=False
         )
         